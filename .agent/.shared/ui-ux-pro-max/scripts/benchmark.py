@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - measures the search engine as the data grows.
+
+The bundled CSVs are scaled synthetically (1x, 10x, 100x rows by default) into
+a temporary directory. For each scale a fresh subprocess reports:
+  - index fit time per domain and stack
+  - p50/p95/p99 latency of representative queries per domain and stack
+  - p50/p95/p99 latency of generate_design_system
+  - peak RSS of the measuring process
+plus the cold-start time of search.py (index on disk, and no index at all).
+
+--render-only compares joined vs streamed rendering (iter_* + write_lines) of
+many design systems: time to first byte, total time and tracemalloc peak.
+
+--check-imports runs only the startup budget: `python -X importtime search.py`
+must stay under IMPORT_BUDGET_MS for a plain domain search (the default call,
+which tries the daemon first and searches in-process when none answers) and
+must not load any of IMPORT_FORBIDDEN. The exit status is non-zero on a
+violation; test_startup.py runs the same check under unittest.
+
+Usage:
+    python benchmark.py [--scales 1 10 100] [--iterations 50] [-o benchmark.json]
+    python benchmark.py --compare old.json -o new.json
+    python benchmark.py --check-imports
+    python benchmark.py --render-only [--render-count 200]
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SOURCE_DATA_DIR = SCRIPTS_DIR.parent / "data"
+
+DOMAIN_QUERIES = {
+    "style": ["glassmorphism dark mode", "minimal clean professional"],
+    "prompt": ["neumorphism css variables", "brutalism checklist"],
+    "color": ["fintech trust blue", "beauty spa soft"],
+    "chart": ["real-time trend dashboard", "comparison bar categories"],
+    "landing": ["hero social proof pricing", "conversion testimonial cta"],
+    "product": ["saas dashboard analytics", "ecommerce luxury"],
+    "ux": ["animation accessibility", "touch target mobile"],
+    "typography": ["elegant luxury serif", "modern tech sans"],
+    "icons": ["navigation menu arrow", "social brand logo"],
+    "react": ["waterfall suspense", "memo rerender bundle"],
+    "web": ["aria focus keyboard", "form autocomplete input"],
+}
+STACK_QUERIES = ["layout responsive form", "state performance list"]
+DESIGN_SYSTEM_QUERIES = ["saas dashboard", "beauty spa wellness service", "fintech crypto"]
+COLD_START_QUERY = ["glassmorphism dark", "--domain", "style", "--no-daemon"]
+
+# Startup budget for the most common call, a plain domain search with the
+# default daemon lookup (STARTUP_QUERY, sent to a port nobody listens on so
+# the in-process fallback is measured too): median of IMPORT_RUNS runs of the
+# summed top-level `-X importtime` figures. That call measured ~90 ms on the
+# reference machine (the daemon client is ~13 ms of it); the budget leaves
+# ~30% headroom for noise and slower machines. Loading design_system eagerly
+# would add ~35 ms and is caught by IMPORT_FORBIDDEN regardless of timing.
+STARTUP_QUERY = ["glassmorphism dark", "--domain", "style"]
+IMPORT_BUDGET_MS = 120.0
+IMPORT_RUNS = 7
+IMPORT_FORBIDDEN = ("design_system",)
+
+# Design systems rendered per --render-only comparison (joined vs streamed)
+RENDER_COUNT = 200
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+# ============ DATA SCALING ============
+def scale_data(target_dir: Path, scale: int):
+    """Copy every CSV with each data row repeated `scale` times (tagged so rows stay distinct)."""
+    for source in SOURCE_DATA_DIR.rglob("*.csv"):
+        dest = target_dir / source.relative_to(SOURCE_DATA_DIR)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            continue
+        header, body = rows[0], rows[1:]
+        with open(dest, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for copy_id in range(scale):
+                for row in body:
+                    if copy_id and row:
+                        row = [f"{row[0]} variant{copy_id}"] + row[1:]
+                    writer.writerow(row)
+
+
+def percentiles(samples: list) -> dict:
+    """p50/p95/p99 and mean in milliseconds."""
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000
+
+    return {
+        "p50_ms": round(pick(0.50), 4),
+        "p95_ms": round(pick(0.95), 4),
+        "p99_ms": round(pick(0.99), 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "samples": len(ordered)
+    }
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# ============ MEASUREMENTS (run inside a per-scale subprocess) ============
+def measure_scale(iterations: int) -> dict:
+    """Measure fit and query latency against UI_PRO_MAX_DATA_DIR."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import core
+    from cache import ResultCache
+    import design_system
+    from design_system import generate_design_system
+
+    # Every query must reach the engine and every design system must be
+    # generated: disable result and design caching
+    core.RESULT_CACHE = ResultCache(max_entries=0)
+    design_system.DESIGN_CACHE = ResultCache(max_entries=0)
+
+    report = {"rows": {}, "fit_ms": {}, "query": {}, "design_system": None}
+    for target in core.ALL_TARGETS:
+        filepath, search_cols, output_cols, tokenizer = core._target_config(target)
+        start = time.perf_counter()
+        index = core._build_index(filepath, search_cols, output_cols, tokenizer)
+        report["fit_ms"][target] = round((time.perf_counter() - start) * 1000, 3)
+        report["rows"][target] = index.bm25.N
+        core.load_index(filepath, search_cols, output_cols, tokenizer)
+
+    for domain, queries in DOMAIN_QUERIES.items():
+        samples = []
+        for _ in range(iterations):
+            for query in queries:
+                start = time.perf_counter()
+                core.search(query, domain)
+                samples.append(time.perf_counter() - start)
+        report["query"][domain] = percentiles(samples)
+
+    for stack in core.STACK_CONFIG:
+        samples = []
+        for _ in range(iterations):
+            for query in STACK_QUERIES:
+                start = time.perf_counter()
+                core.search_stack(query, stack)
+                samples.append(time.perf_counter() - start)
+        report["query"][f"stack:{stack}"] = percentiles(samples)
+
+    samples = []
+    for _ in range(max(1, iterations // 5)):
+        for query in DESIGN_SYSTEM_QUERIES:
+            start = time.perf_counter()
+            generate_design_system(query)
+            samples.append(time.perf_counter() - start)
+    report["design_system"] = percentiles(samples)
+
+    report["peak_rss_kb"] = peak_rss_kb()
+    return report
+
+
+def measure_cold_start(env: dict, runs: int, index_dir: Path) -> dict:
+    """Wall time of a full `search.py` process, with the index on disk and without it."""
+    command = [sys.executable, str(SCRIPTS_DIR / "search.py"), *COLD_START_QUERY]
+    result = {}
+    for label, keep_index in (("index_on_disk", True), ("no_index", False)):
+        samples = []
+        for _ in range(runs):
+            if not keep_index:
+                shutil.rmtree(index_dir, ignore_errors=True)
+            start = time.perf_counter()
+            subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            samples.append(time.perf_counter() - start)
+        result[label] = percentiles(samples)
+    return result
+
+
+def _free_port() -> int:
+    """A localhost port with nothing listening on it (right now)."""
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_imports(runs: int = IMPORT_RUNS) -> dict:
+    """Import cost of a default `search.py` domain search, from `python -X importtime`."""
+    command = [sys.executable, "-X", "importtime", str(SCRIPTS_DIR / "search.py"), *STARTUP_QUERY,
+               "--port", str(_free_port())]
+    totals, modules = [], set()
+    for _ in range(runs):
+        proc = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+        total_us = 0
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_RE.match(line)
+            if not match:
+                continue
+            modules.add(match.group(4))
+            if not match.group(3):
+                total_us += int(match.group(2))  # cumulative time of a top-level import
+        totals.append(total_us / 1000)
+    return {
+        "import_ms": round(statistics.median(totals), 3),
+        "budget_ms": IMPORT_BUDGET_MS,
+        "forbidden_loaded": sorted(name for name in IMPORT_FORBIDDEN if name in modules),
+        "modules": len(modules)
+    }
+
+
+def check_imports() -> bool:
+    """Print the startup import report; False when over budget or a forbidden module loads."""
+    report = measure_imports()
+    print(json.dumps(report, indent=2))
+    ok = report["import_ms"] <= IMPORT_BUDGET_MS and not report["forbidden_loaded"]
+    if not ok:
+        print("[bench] search.py startup exceeds its import budget", file=sys.stderr)
+    return ok
+
+
+class _Sink:
+    """Text stream that discards writes but remembers when the first byte arrived."""
+
+    def __init__(self):
+        self.first_write = None
+        self.chars = 0
+
+    def write(self, text):
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        self.chars += len(text)
+
+
+def measure_rendering(count: int) -> dict:
+    """Render `count` design systems joined (format_*) and streamed (iter_* + write_lines)."""
+    import tracemalloc
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import design_system as ds
+
+    with open(SOURCE_DATA_DIR / "products.csv", 'r', encoding='utf-8', newline='') as f:
+        queries = [row["Product Type"] for row in csv.DictReader(f)]
+    generator = ds.DesignSystemGenerator()
+    systems = [generator.generate(queries[i % len(queries)]) for i in range(count)]
+
+    renderers = {
+        "ascii": (ds.format_ascii_box, ds.iter_ascii_box),
+        "markdown": (ds.format_markdown, ds.iter_markdown),
+        "master_md": (ds.format_master_md, ds.iter_master_md),
+    }
+    report = {"design_systems": count}
+    for name, (format_fn, iter_fn) in renderers.items():
+        modes = {
+            "joined": lambda sink: [sink.write(format_fn(system) + "\n") for system in systems],
+            "streamed": lambda sink: [ds.write_lines(iter_fn(system), sink) for system in systems],
+        }
+        report[name] = {}
+        for mode, run in modes.items():
+            sink = _Sink()
+            start = time.perf_counter()
+            run(sink)
+            total = time.perf_counter() - start
+            # Separate pass for memory: tracemalloc slows allocation-heavy code down
+            tracemalloc.start()
+            run(_Sink())
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            report[name][mode] = {
+                "ttfb_ms": round((sink.first_write - start) * 1000, 4),
+                "total_ms": round(total * 1000, 3),
+                "peak_kb": round(peak / 1024, 1),
+                "chars": sink.chars
+            }
+    return report
+
+
+def run_benchmark(scales: list, iterations: int, cold_runs: int) -> dict:
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "startup_imports": measure_imports(),
+        "render": measure_rendering(RENDER_COUNT),
+        "scales": {}
+    }
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"uipro-bench-{scale}x-") as tmp:
+            data_dir = Path(tmp) / "data"
+            index_dir = Path(tmp) / "index"
+            scale_data(data_dir, scale)
+            env = dict(os.environ, UI_PRO_MAX_DATA_DIR=str(data_dir), UI_PRO_MAX_INDEX_DIR=str(index_dir),
+                       PYTHONIOENCODING="utf-8")
+
+            print(f"[bench] {scale}x: measuring fit/query latency...", file=sys.stderr)
+            proc = subprocess.run(
+                [sys.executable, __file__, "--measure", "--iterations", str(iterations)],
+                env=env, capture_output=True, text=True, check=True
+            )
+            scale_report = json.loads(proc.stdout)
+
+            print(f"[bench] {scale}x: measuring search.py cold start...", file=sys.stderr)
+            scale_report["cold_start"] = measure_cold_start(env, cold_runs, index_dir)
+            report["scales"][f"{scale}x"] = scale_report
+    return report
+
+
+def _git_commit():
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=False)
+        return proc.stdout.strip() or None
+    except OSError:
+        return None
+
+
+# ============ REPORTING ============
+def summarize_rendering(render: dict):
+    print(f"rendering {render['design_systems']} design systems (joined vs streamed):")
+    for name, modes in render.items():
+        if not isinstance(modes, dict):
+            continue
+        for mode, stats in modes.items():
+            print(f"  {name:<10} {mode:<9} ttfb {stats['ttfb_ms']:>9.3f} ms  total {stats['total_ms']:>9.2f} ms"
+                  f"  peak {stats['peak_kb']:>8.1f} KB")
+
+
+def summarize(report: dict, baseline: dict = None):
+    """Print a compact table; with a baseline, show the p50 ratio new/old."""
+    imports = report.get("startup_imports")
+    if imports:
+        print(f"search.py imports: {imports['import_ms']:.1f} ms (budget {imports['budget_ms']:.0f} ms)")
+    if report.get("render"):
+        summarize_rendering(report["render"])
+    for scale, data in report["scales"].items():
+        old = (baseline or {}).get("scales", {}).get(scale, {})
+        print(f"\n=== {scale} ===")
+        print(f"fit total: {sum(data['fit_ms'].values()):.1f} ms | peak RSS: {data.get('peak_rss_kb')} KB")
+        rows = [(name, stats, old.get("query", {}).get(name)) for name, stats in data["query"].items()]
+        rows.append(("design_system", data["design_system"], old.get("design_system")))
+        for label, stats in data["cold_start"].items():
+            rows.append((f"cold_start:{label}", stats, old.get("cold_start", {}).get(label)))
+        for name, stats, previous in rows:
+            line = f"  {name:<24} p50 {stats['p50_ms']:>9.3f}  p95 {stats['p95_ms']:>9.3f}  p99 {stats['p99_ms']:>9.3f} ms"
+            if previous:
+                line += f"  (p50 x{stats['p50_ms'] / max(previous['p50_ms'], 1e-9):.2f} vs baseline)"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max search benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Row multipliers (default: 1 10 100)")
+    parser.add_argument("--iterations", type=int, default=50, help="Repetitions per query (default: 50)")
+    parser.add_argument("--cold-runs", type=int, default=5, help="search.py launches per cold-start measurement (default: 5)")
+    parser.add_argument("--output", "-o", type=str, default="benchmark.json", help="JSON report path (default: benchmark.json)")
+    parser.add_argument("--compare", type=str, default=None, help="Previous JSON report to compare p50 latency against")
+    parser.add_argument("--render-only", action="store_true", help="Only compare joined vs streamed rendering")
+    parser.add_argument("--render-count", type=int, default=RENDER_COUNT, help=f"Design systems per rendering comparison (default: {RENDER_COUNT})")
+    parser.add_argument("--check-imports", action="store_true", help="Only check search.py startup against the import budget")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.check_imports:
+        raise SystemExit(0 if check_imports() else 1)
+    if args.render_only:
+        summarize_rendering(measure_rendering(args.render_count))
+        raise SystemExit(0)
+
+    if args.measure:
+        print(json.dumps(measure_scale(args.iterations)))
+        raise SystemExit(0)
+
+    report = run_benchmark(args.scales, args.iterations, args.cold_runs)
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    summarize(report, baseline)
+    print(f"\nJSON written to: {Path(args.output).resolve()}")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Result Cache - LRU + TTL cache for search results.
+
+Entries are keyed on (kind, normalized query, domain/stack, max_results,
+data version). The data version hashes the mtime and size of every CSV under
+DATA_DIR, so editing any CSV invalidates every cached result automatically
+(within DATA_VERSION_MAX_AGE seconds in a long-running process).
+The cache lives in memory and can optionally be mirrored to a small JSON
+store under .agent/.cache/.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL = 3600  # seconds
+DATA_VERSION_MAX_AGE = 1.0  # seconds a computed data version is reused before re-scanning
+DISK_CACHE_FILE = Path(__file__).resolve().parents[3] / ".cache" / "ui-ux-pro-max-results.json"
+
+
+# data_dir -> (computed_at, version); one design system runs several searches back to back
+_DATA_VERSIONS = {}
+
+
+def _csv_stats(root: str, prefix: str = ""):
+    """Yield (relative posix path, mtime_ns, size) for every CSV below root."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from _csv_stats(entry.path, f"{prefix}{entry.name}/")
+            elif entry.name.endswith(".csv"):
+                stat = entry.stat()
+                yield f"{prefix}{entry.name}", stat.st_mtime_ns, stat.st_size
+
+
+def data_version(data_dir: Path) -> str:
+    """Short hash of (path, mtime, size) for every CSV under data_dir."""
+    now = time.monotonic()
+    memo = _DATA_VERSIONS.get(data_dir)
+    if memo and now - memo[0] < DATA_VERSION_MAX_AGE:
+        return memo[1]
+    digest = hashlib.sha1()
+    try:
+        for rel_path, mtime_ns, size in sorted(_csv_stats(str(data_dir))):
+            digest.update(f"{rel_path}:{mtime_ns}:{size};".encode("utf-8"))
+    except FileNotFoundError:
+        pass
+    version = digest.hexdigest()[:16]
+    _DATA_VERSIONS[data_dir] = (now, version)
+    return version
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query for cache keys."""
+    return " ".join(str(query).lower().split())
+
+
+class ResultCache:
+    """LRU cache with per-entry TTL and hit/miss counters (safe to share between threads)."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (stored_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version = None
+        self.disk_path = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, query: str, target, max_results: int, version: str, *extra) -> str:
+        """Build a stable string key (also used as the JSON key on disk)."""
+        if version != self.version:
+            with self._lock:
+                if self.version is not None:
+                    # Data changed: nothing cached under the old version can be hit again
+                    self.entries.clear()
+                self.version = version
+        return json.dumps([kind, normalize_query(query), target, max_results, version, *extra])
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self._dirty = True
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "disk": str(self.disk_path) if self.disk_path else None
+        }
+
+    # ---- optional on-disk store ----
+    def enable_disk(self, path: Path = DISK_CACHE_FILE):
+        """Load entries from a JSON store and save them back at interpreter exit."""
+        self.disk_path = Path(path)
+        try:
+            stored = json.loads(self.disk_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            stored = {}
+        now = time.time()
+        for key, (stored_at, value) in stored.items():
+            if now - stored_at <= self.ttl and key not in self.entries:
+                self.entries[key] = (stored_at, value)
+        atexit.register(self.save)
+
+    def save(self):
+        """Write the current entries to the disk store (no-op when unchanged)."""
+        if not self.disk_path or not self._dirty:
+            return
+        tmp_path = None
+        try:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                snapshot = dict(self.entries)
+            # A temp file of its own per call: threads and processes may save at once
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.disk_path.parent,
+                                             prefix=f"{self.disk_path.name}.", suffix=".tmp",
+                                             delete=False) as tmp:
+                tmp_path = tmp.name
+                json.dump(snapshot, tmp, ensure_ascii=False)
+            os.replace(tmp_path, self.disk_path)
+            self._dirty = False
+        except OSError:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
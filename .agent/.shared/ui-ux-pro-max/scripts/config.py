@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Config - data locations and the domain/stack tables.
+
+Kept free of engine imports so the CLI can parse arguments (and talk to a
+running daemon) without loading the search engine.
+"""
+
+import os
+from pathlib import Path
+
+# UI_PRO_MAX_DATA_DIR / UI_PRO_MAX_INDEX_DIR point the engine at other data (used by benchmark.py)
+DATA_DIR = Path(os.environ.get("UI_PRO_MAX_DATA_DIR") or Path(__file__).parent.parent / "data")
+INDEX_DIR = Path(os.environ.get("UI_PRO_MAX_INDEX_DIR") or Path(__file__).parent.parent / "index")
+DAEMON_PORT = int(os.environ.get("UI_PRO_MAX_PORT", "47863"))
+# Holds one per-user secret (mode 0600) per daemon port, daemon-<port>.token, written by --serve
+DAEMON_TOKEN_DIR = Path(os.environ.get("UI_PRO_MAX_TOKEN_DIR") or Path.home() / ".cache" / "ui-ux-pro-max")
+MAX_RESULTS = 3
+MAX_DOMAINS = 3
+BACKENDS = ("python", "numpy")
+
+# "field_priority" orders a domain's output_cols from most to least useful per
+# byte; search.py --budget fills results in that order
+
+CSV_CONFIG = {
+    "style": {
+        "file": "styles.csv",
+        "search_cols": ["Style Category", "Keywords", "Best For", "Type"],
+        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity"],
+        "field_priority": ["Style Category", "Keywords", "Best For", "Primary Colors", "Effects & Animation", "Type", "Accessibility", "Performance", "Complexity", "Framework Compatibility"]
+    },
+    "prompt": {
+        "file": "prompts.csv",
+        "search_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords"],
+        "output_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"],
+        "field_priority": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"]
+    },
+    "color": {
+        "file": "colors.csv",
+        "search_cols": ["Product Type", "Keywords", "Notes"],
+        "output_cols": ["Product Type", "Keywords", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)", "Notes"],
+        "field_priority": ["Product Type", "Primary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Secondary (Hex)", "Border (Hex)", "Notes", "Keywords"]
+    },
+    "chart": {
+        "file": "charts.csv",
+        "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
+        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"],
+        "field_priority": ["Data Type", "Best Chart Type", "Secondary Options", "Accessibility Notes", "Library Recommendation", "Color Guidance", "Interactive Level", "Keywords"]
+    },
+    "landing": {
+        "file": "landing.csv",
+        "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
+        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"],
+        "field_priority": ["Pattern Name", "Section Order", "Primary CTA Placement", "Conversion Optimization", "Color Strategy", "Keywords"]
+    },
+    "product": {
+        "file": "products.csv",
+        "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
+        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"],
+        "field_priority": ["Product Type", "Primary Style Recommendation", "Landing Page Pattern", "Color Palette Focus", "Secondary Styles", "Dashboard Style (if applicable)", "Keywords"]
+    },
+    "ux": {
+        "file": "ux-guidelines.csv",
+        "search_cols": ["Category", "Issue", "Description", "Platform"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_priority": ["Issue", "Do", "Don't", "Severity", "Description", "Category", "Platform", "Code Example Good", "Code Example Bad"]
+    },
+    "typography": {
+        "file": "typography.csv",
+        "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
+        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"],
+        "field_priority": ["Font Pairing Name", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Category", "Notes"]
+    },
+    "icons": {
+        "file": "icons.csv",
+        "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
+        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"],
+        "field_priority": ["Icon Name", "Library", "Import Code", "Usage", "Category", "Keywords", "Best For", "Style"]
+    },
+    "react": {
+        "file": "react-performance.csv",
+        "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_priority": ["Issue", "Do", "Don't", "Severity", "Description", "Category", "Platform", "Code Example Good", "Code Example Bad"]
+    },
+    "web": {
+        "file": "web-interface.csv",
+        "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_priority": ["Issue", "Do", "Don't", "Severity", "Description", "Category", "Platform", "Code Example Good", "Code Example Bad"]
+    }
+}
+
+STACK_CONFIG = {
+    "html-tailwind": {"file": "stacks/html-tailwind.csv"},
+    "react": {"file": "stacks/react.csv"},
+    "nextjs": {"file": "stacks/nextjs.csv"},
+    "vue": {"file": "stacks/vue.csv"},
+    "nuxtjs": {"file": "stacks/nuxtjs.csv"},
+    "nuxt-ui": {"file": "stacks/nuxt-ui.csv"},
+    "svelte": {"file": "stacks/svelte.csv"},
+    "swiftui": {"file": "stacks/swiftui.csv"},
+    "react-native": {"file": "stacks/react-native.csv"},
+    "flutter": {"file": "stacks/flutter.csv"},
+    "shadcn": {"file": "stacks/shadcn.csv"},
+    "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
+}
+
+# Common columns for all stacks
+STACK_COLS = {
+    "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
+    "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"],
+    "field_priority": ["Guideline", "Do", "Don't", "Severity", "Description", "Category", "Code Good", "Code Bad", "Docs URL"]
+}
+
+AVAILABLE_STACKS = list(STACK_CONFIG.keys())
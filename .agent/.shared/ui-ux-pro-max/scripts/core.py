@@ -5,217 +5,615 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import heapq
+import io
+import os
+import pickle
 import re
+import sys
+import time
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
+from array import array
 from math import log
 from collections import defaultdict
 
+from cache import ResultCache, data_version
+from config import (
+    AVAILABLE_STACKS, BACKENDS, CSV_CONFIG, DATA_DIR, INDEX_DIR, MAX_DOMAINS, MAX_RESULTS,
+    STACK_COLS, STACK_CONFIG
+)
+
 # ============ CONFIGURATION ============
-DATA_DIR = Path(__file__).parent.parent / "data"
-MAX_RESULTS = 3
-
-CSV_CONFIG = {
-    "style": {
-        "file": "styles.csv",
-        "search_cols": ["Style Category", "Keywords", "Best For", "Type"],
-        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity"]
-    },
-    "prompt": {
-        "file": "prompts.csv",
-        "search_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords"],
-        "output_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"]
-    },
-    "color": {
-        "file": "colors.csv",
-        "search_cols": ["Product Type", "Keywords", "Notes"],
-        "output_cols": ["Product Type", "Keywords", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)", "Notes"]
-    },
-    "chart": {
-        "file": "charts.csv",
-        "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
-        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
-    },
-    "landing": {
-        "file": "landing.csv",
-        "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
-        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
-    },
-    "product": {
-        "file": "products.csv",
-        "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
-        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
-    },
-    "ux": {
-        "file": "ux-guidelines.csv",
-        "search_cols": ["Category", "Issue", "Description", "Platform"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "typography": {
-        "file": "typography.csv",
-        "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
-        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
-    },
-    "icons": {
-        "file": "icons.csv",
-        "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
-        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
-    },
-    "react": {
-        "file": "react-performance.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "web": {
-        "file": "web-interface.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    }
-}
+INDEX_VERSION = 6
 
-STACK_CONFIG = {
-    "html-tailwind": {"file": "stacks/html-tailwind.csv"},
-    "react": {"file": "stacks/react.csv"},
-    "nextjs": {"file": "stacks/nextjs.csv"},
-    "vue": {"file": "stacks/vue.csv"},
-    "nuxtjs": {"file": "stacks/nuxtjs.csv"},
-    "nuxt-ui": {"file": "stacks/nuxt-ui.csv"},
-    "svelte": {"file": "stacks/svelte.csv"},
-    "swiftui": {"file": "stacks/swiftui.csv"},
-    "react-native": {"file": "stacks/react-native.csv"},
-    "flutter": {"file": "stacks/flutter.csv"},
-    "shadcn": {"file": "stacks/shadcn.csv"},
-    "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
-}
+# Worker threads for search_many(parallel=True)
+SEARCH_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+_EXECUTOR = None
 
-# Common columns for all stacks
-_STACK_COLS = {
-    "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
-    "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
-}
+# Fuzzy/prefix expansion of query terms, used only when no query term is in an
+# index's vocabulary (queries with any exact hit rank exactly as before)
+FUZZY_EXPANSION = True
+FUZZY_MIN_SIMILARITY = 0.6   # trigram Dice coefficient (or prefix length ratio) to accept a term
+FUZZY_MIN_PREFIX = 4         # shortest query term expanded by prefix
+FUZZY_MAX_EXPANSIONS = 3     # vocabulary terms substituted per unknown query term
+
+
+# ============ TOKENIZER ============
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+STOP_WORDS = frozenset({
+    "and", "are", "but", "for", "from", "has", "have", "into", "its", "not", "that", "the",
+    "their", "then", "there", "these", "this", "use", "using", "via", "was", "were", "when",
+    "which", "while", "will", "with", "without", "you", "your"
+})
+
+_STEM_SUFFIXES = ("ational", "ization", "fulness", "iveness", "ations", "ation", "ments", "ment",
+                  "ness", "ings", "ing", "ies", "ied", "ers", "ed", "er", "ly", "es", "s")
+
+
+def _stem(word):
+    """Light suffix-stripping stemmer (keeps at least 3 characters of stem)"""
+    for suffix in _STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix in ("ies", "ied"):
+                return word[:-3] + "y"
+            return word[:-len(suffix)]
+    return word
+
+
+class Tokenizer:
+    """
+    Token pipeline: lowercase, strip punctuation, drop short words, then
+    optionally remove stop words and stem. Calls are LRU-memoized per text
+    (queries repeat; documents are tokenized once through _tokenize) and
+    every token is interned so repeated terms share one string object.
+
+    Options come from the "tokenizer" key of a CSV_CONFIG entry, e.g.
+    {"stopwords": True, "stem": True}. The defaults reproduce the original
+    BM25.tokenize behaviour exactly.
+    """
+
+    def __init__(self, min_length=3, stopwords=False, stem=False, cache_size=8192):
+        self.min_length = min_length
+        self.stopwords = stopwords
+        self.stem = stem
+        self._tokenize_cached = lru_cache(maxsize=cache_size)(self._tokenize)
 
-AVAILABLE_STACKS = list(STACK_CONFIG.keys())
+    @property
+    def options(self):
+        return {"min_length": self.min_length, "stopwords": self.stopwords, "stem": self.stem}
+
+    def __reduce__(self):
+        # Unpickle to the shared instance so indexes loaded from disk share one cache
+        return (get_tokenizer, (self.options,))
+
+    def __call__(self, text):
+        return self._tokenize_cached(str(text))
+
+    def _tokenize(self, text):
+        words = _NON_WORD_RE.sub(' ', text.lower()).split()
+        tokens = [w for w in words if len(w) >= self.min_length]
+        if self.stopwords:
+            tokens = [w for w in tokens if w not in STOP_WORDS]
+        if self.stem:
+            tokens = [_stem(w) for w in tokens]
+        return tuple(sys.intern(w) for w in tokens)
+
+
+# Shared tokenizer instances: options -> Tokenizer
+_TOKENIZERS = {}
+
+
+def get_tokenizer(options=None):
+    """Return the shared Tokenizer for a CSV_CONFIG "tokenizer" options dict"""
+    # Key on the normalized options so {} and the explicit defaults (as stored
+    # in a pickled index) resolve to the same instance
+    tokenizer = Tokenizer(**dict(options or {}))
+    return _TOKENIZERS.setdefault(tuple(sorted(tokenizer.options.items())), tokenizer)
+
+
+def _trigrams(term):
+    """Distinct character trigrams of a term, padded so short words still get some"""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
 
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.tokenizer = tokenizer or get_tokenizer()
         self.doc_lengths = []
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
+        self.vocab = []        # sorted terms, for prefix lookups
+        self.trigrams = {}     # trigram -> [terms], for misspelling lookups
         self.N = 0
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Tokenize text with this model's token pipeline"""
+        return self.tokenizer(text)
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        """Build BM25 inverted index (term -> [(doc_id, tf)]) from documents"""
+        # Uncached: each document is seen once and would only push queries out of the LRU
+        corpus = [self.tokenizer._tokenize(str(doc)) for doc in documents]
+        self.doc_lengths = [len(doc) for doc in corpus]
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+        postings = defaultdict(list)
+        for doc_id, doc in enumerate(corpus):
             term_freqs = defaultdict(int)
             for word in doc:
                 term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((doc_id, tf))
+        self._finish_fit(dict(postings))
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
+    def _finish_fit(self, postings):
+        """Derive corpus statistics, length norms and idf from postings and doc_lengths"""
+        self.N = len(self.doc_lengths)
+        if self.N == 0:
+            return
+        self.avgdl = sum(self.doc_lengths) / self.N
+        self.postings = postings
+
+        # Length normalisation part of the BM25 denominator, fixed per document
+        if self.avgdl:
+            self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+        else:
+            self.doc_norms = [self.k1 * (1 - self.b)] * self.N
+
+        for word, posting in self.postings.items():
+            self.doc_freqs[word] = len(posting)
+            self.idf[word] = log((self.N - len(posting) + 0.5) / (len(posting) + 0.5) + 1)
+
+        self.vocab = sorted(self.postings)
+        trigrams = defaultdict(list)
+        for word in self.vocab:
+            for gram in _trigrams(word):
+                trigrams[gram].append(word)
+        self.trigrams = dict(trigrams)
+
+    def expand_term(self, token):
+        """
+        Map a query term missing from the vocabulary to close vocabulary terms.
+
+        Candidates come from the prefix range of the sorted vocabulary (for
+        partial words such as "glassmorph") and from shared trigrams (for typos
+        such as "dashbord"). Each carries a weight below 1: the prefix length
+        ratio or the trigram Dice coefficient. Returns [(term, weight)], best first.
+        """
+        weights = {}
+        if len(token) >= FUZZY_MIN_PREFIX:
+            start = bisect_left(self.vocab, token)
+            for word in self.vocab[start:]:
+                if not word.startswith(token):
+                    break
+                weights[word] = len(token) / len(word)
+
+        grams = _trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for word in self.trigrams.get(gram, ()):
+                shared[word] += 1
+        for word, count in shared.items():
+            dice = 2 * count / (len(grams) + len(_trigrams(word)))
+            if dice > weights.get(word, 0):
+                weights[word] = dice
+
+        ranked = sorted(((w, t) for t, w in weights.items() if w >= FUZZY_MIN_SIMILARITY), key=lambda x: (-x[0], x[1]))
+        return [(term, weight) for weight, term in ranked[:FUZZY_MAX_EXPANSIONS]]
+
+    def query_terms(self, query, fuzzy=True):
+        """
+        Tokenize a query into (term, weight) pairs; exact terms have weight 1.0.
+
+        With fuzzy, tokens are expanded only when none of them is in the
+        vocabulary, so a correctly spelled word never pulls in look-alikes.
+        """
+        tokens = self.tokenize(query)
+        terms = [(token, 1.0) for token in tokens if token in self.postings]
+        if fuzzy and not terms:
+            for token in tokens:
+                terms.extend(self.expand_term(token))
+        return terms
+
+    @classmethod
+    def merge(cls, models):
+        """
+        Build one model over the union of several fitted models' documents.
+
+        Postings are concatenated with shifted doc ids and idf / length norms
+        are recomputed over the combined corpus, so no document is re-tokenized.
+        All models must share one tokenizer.
+        """
+        merged = cls(models[0].k1, models[0].b, models[0].tokenizer) if models else cls()
+        postings = defaultdict(list)
+        offset = 0
+        for model in models:
+            for term, posting in model.postings.items():
+                postings[term].extend((doc_id + offset, tf) for doc_id, tf in posting)
+            merged.doc_lengths.extend(model.doc_lengths)
+            offset += model.N
+        merged._finish_fit(dict(postings))
+        return merged
+
+    def score(self, query, top_k=None, fuzzy=True):
+        """
+        Score documents containing at least one query term.
+
+        Returns (doc_id, score) pairs sorted by score, ties broken by doc_id.
+        Documents without any query term score 0 and are omitted. With fuzzy,
+        a query with no known term is expanded to close vocabulary terms whose
+        contribution is scaled down by their similarity weight.
+        """
+        scores = defaultdict(float)
+        k1_plus_1 = self.k1 + 1
+        norms = self.doc_norms
+
+        for term, weight in self.query_terms(query, fuzzy):
+            idf = self.idf[term]
+            if weight == 1.0:
+                for doc_id, tf in self.postings[term]:
+                    scores[doc_id] += idf * (tf * k1_plus_1) / (tf + norms[doc_id])
+            else:
+                for doc_id, tf in self.postings[term]:
+                    scores[doc_id] += idf * (tf * k1_plus_1) / (tf + norms[doc_id]) * weight
+
+        if top_k is None:
+            return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return heapq.nlargest(top_k, scores.items(), key=lambda x: (x[1], -x[0]))
+
+
+class BM25Matrix:
+    """
+    Sparse term-document matrix of precomputed BM25 weights (NumPy backend).
+
+    Each term owns a contiguous slice of (doc_ids, weights), i.e. the matrix
+    is stored row-per-term. A query gathers the rows of its terms, sums them
+    into a dense score vector and selects the top-k with argpartition. Weights
+    are computed with the same float expression as BM25.score, so rankings
+    and scores are identical to the pure-Python backend.
+    """
+
+    def __init__(self, bm25):
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("The numpy search backend requires NumPy (pip install numpy)") from None
+        self.np = np
+        self.bm25 = bm25
+        self.term_slices = {}
+
+        k1_plus_1 = bm25.k1 + 1
+        doc_ids, weights = [], []
+        for term, posting in bm25.postings.items():
+            start = len(doc_ids)
+            idf = bm25.idf[term]
+            for doc_id, tf in posting:
+                doc_ids.append(doc_id)
+                weights.append(idf * (tf * k1_plus_1) / (tf + bm25.doc_norms[doc_id]))
+            self.term_slices[term] = (start, len(doc_ids))
+        self.doc_ids = np.array(doc_ids, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+
+    def score(self, query, top_k=None, fuzzy=True):
+        """Same contract as BM25.score: positive scores only, ties broken by doc_id"""
+        np = self.np
+        scores = np.zeros(self.bm25.N, dtype=np.float64)
+        for term, weight in self.bm25.query_terms(query, fuzzy):
+            start, end = self.term_slices[term]
+            # doc_ids are unique within one term, so fancy-index += is exact
+            if weight == 1.0:
+                scores[self.doc_ids[start:end]] += self.weights[start:end]
+            else:
+                scores[self.doc_ids[start:end]] += self.weights[start:end] * weight
+
+        candidates = np.flatnonzero(scores > 0)
+        if top_k is not None and len(candidates) > top_k:
+            if top_k <= 0:
+                return []
+            # Keep everything tied with the k-th best score so tie-breaking stays exact
+            pivot = len(candidates) - top_k
+            kth = np.partition(scores[candidates], pivot)[pivot]
+            candidates = candidates[scores[candidates] >= kth]
+        order = np.lexsort((candidates, -scores[candidates]))
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+
+# ============ COLUMNAR ROW STORAGE ============
+class CsvRows:
+    """
+    Lazy access to the output columns of a CSV, one record at a time.
+
+    Only the header and the byte span of every record are kept in memory;
+    a row is read and parsed from disk when a query actually returns it.
+    Rows are shaped like csv.DictReader rows (missing fields are None).
+    """
+
+    def __init__(self, filepath, header, starts, ends, output_cols):
+        self.filepath = filepath
+        self.starts = starts
+        self.ends = ends
+        positions = {name: i for i, name in enumerate(header)}
+        self.fields = [(col, positions[col]) for col in output_cols if col in positions]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def get_many(self, indices):
+        """Parse the output columns of several records with one file handle"""
+        rows = []
+        with open(self.filepath, 'rb') as f:
+            for idx in indices:
+                f.seek(self.starts[idx])
+                record = f.read(self.ends[idx] - self.starts[idx]).decode('utf-8')
+                # Universal newlines, as when the CSV is opened in text mode
+                record = record.replace('\r\n', '\n').replace('\r', '\n')
+                values = next(csv.reader(io.StringIO(record, newline='')))
+                rows.append({col: values[i] if i < len(values) else None for col, i in self.fields})
+        return rows
+
+    def get(self, idx):
+        return self.get_many([idx])[0]
+
+
+def _scan_csv(filepath, search_cols):
+    """
+    Single pass over a CSV returning (header, search documents, record starts, record ends).
+
+    Byte offsets are tracked per physical line so multi-line quoted fields
+    are spanned correctly; blank records are skipped like csv.DictReader.
+    """
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+
+    position = [0]
+
+    def lines():
+        for line in raw.splitlines(keepends=True):
+            position[0] += len(line)
+            text = line.decode('utf-8')
+            # Universal newlines, as when the CSV is opened in text mode
+            if text.endswith(('\r', '\n')):
+                text = text.rstrip('\r\n') + '\n'
+            yield text
+
+    reader = csv.reader(lines())
+    header = next(reader, [])
+    columns = {name: i for i, name in enumerate(header)}
+    search_positions = [columns.get(col) for col in search_cols]
+
+    documents, starts, ends = [], array('q'), array('q')
+    start = position[0]
+    for values in reader:
+        end = position[0]
+        if values:
+            # Mirror str(row.get(col, "")) on a DictReader row
+            documents.append(" ".join(
+                "" if i is None else str(values[i]) if i < len(values) else "None"
+                for i in search_positions
+            ))
+            starts.append(start)
+            ends.append(end)
+        start = end
+    return header, documents, starts, ends
+
+
+# ============ PERSISTENT INDEX ============
+class SearchIndex:
+    """Fitted BM25 model plus the output rows of one CSV file"""
+
+    def __init__(self, bm25, rows, output_cols):
+        self.bm25 = bm25
+        self.rows = rows
+        self.output_cols = output_cols
+        self.matrix = None
+
+    def __getstate__(self):
+        # The NumPy matrix is rebuilt on demand; never persist it
+        state = self.__dict__.copy()
+        state["matrix"] = None
+        return state
+
+    def score(self, query, top_k=None, backend="python", fuzzy=None):
+        """Rank rows against a query with the selected scoring backend (fuzzy defaults to FUZZY_EXPANSION)"""
+        fuzzy = FUZZY_EXPANSION if fuzzy is None else fuzzy
+        if backend == "python":
+            return self.bm25.score(query, top_k, fuzzy)
+        if backend == "numpy":
+            if self.matrix is None:
+                self.matrix = BM25Matrix(self.bm25)
+            return self.matrix.score(query, top_k, fuzzy)
+        raise ValueError(f"Unknown backend: {backend}. Available: {', '.join(BACKENDS)}")
+
+    def row(self, idx):
+        """Return the output columns of one ranked row"""
+        return self.rows.get(idx)
+
+    def rows_for(self, indices):
+        """Return the output columns of several ranked rows"""
+        return self.rows.get_many(indices) if indices else []
+
+
+# In-process cache: csv path -> (source stamp, SearchIndex)
+_INDEX_CACHE = {}
+
+
+def _source_stamp(filepath):
+    """Cheap change marker for a CSV file (mtime + size)"""
+    stat = filepath.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_sha256(filepath):
+    """Content hash used when the mtime changed but the data may not have"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _index_path(filepath):
+    """Index file location mirroring the CSV layout under DATA_DIR"""
+    try:
+        rel = filepath.relative_to(DATA_DIR)
+    except ValueError:
+        rel = Path(filepath.name)
+    return INDEX_DIR / rel.with_suffix(".idx")
+
+
+def _build_index(filepath, search_cols, output_cols, tokenizer=None):
+    """Scan a CSV once, fit BM25 over its search columns and record row offsets"""
+    header, documents, starts, ends = _scan_csv(filepath, search_cols)
+
+    bm25 = BM25(tokenizer=get_tokenizer(tokenizer))
+    bm25.fit(documents)
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    # Output columns stay on disk until a query returns the row
+    rows = CsvRows(filepath, header, starts, ends, output_cols)
+    return SearchIndex(bm25, rows, output_cols)
+
+
+def _read_index_file(path):
+    """Load a pickled index file, returning None when missing or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+        return None
+
+
+def _write_index_file(path, payload):
+    """Atomically write an index file; the index is only a cache, so failures are ignored"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_index(filepath, search_cols, output_cols, tokenizer=None):
+    """
+    Return the fitted index for a CSV, rebuilding it only when the CSV changed.
+
+    Indexes are kept in memory for the life of the process and persisted under
+    INDEX_DIR. A stored index is reused when the CSV mtime/size match, or when
+    only the mtime moved and the content hash is unchanged. tokenizer is the
+    optional "tokenizer" options dict of the CSV_CONFIG entry.
+    """
+    stamp = _source_stamp(filepath)
+    cached = _INDEX_CACHE.get(filepath)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    config = (list(search_cols), list(output_cols), get_tokenizer(tokenizer).options)
+    index_path = _index_path(filepath)
+    payload = _read_index_file(index_path)
+    if not (isinstance(payload, dict) and payload.get("version") == INDEX_VERSION and payload.get("config") == config):
+        payload = None
+
+    if payload and payload["stamp"] != stamp:
+        if payload["sha256"] == _file_sha256(filepath):
+            payload["stamp"] = stamp
+            _write_index_file(index_path, payload)
+        else:
+            payload = None
+
+    if payload is None:
+        payload = {
+            "version": INDEX_VERSION,
+            "config": config,
+            "stamp": stamp,
+            "sha256": _file_sha256(filepath),
+            "index": _build_index(filepath, search_cols, output_cols, tokenizer),
+        }
+        _write_index_file(index_path, payload)
+
+    # The pickle holds the CSV path it was built from; rows must be read from
+    # this CSV even when the tree was moved or copied since
+    payload["index"].rows.filepath = filepath
+    _INDEX_CACHE[filepath] = (stamp, payload["index"])
+    return payload["index"]
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
-
-
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
+def _search_csv(filepath, search_cols, output_cols, query, max_results, backend="python", tokenizer=None, fuzzy=None):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    index = load_index(filepath, search_cols, output_cols, tokenizer)
+    ranked = index.score(query, top_k=max_results, backend=backend, fuzzy=fuzzy)
 
     # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    return index.rows_for([idx for idx, score in ranked if score > 0])
+
+
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
 
 
-def detect_domain(query):
-    """Auto-detect the most relevant domain from query"""
+def _domain_keyword_hits(query):
+    """Count keyword hits per domain (the prior used by detect_domain and search_all)"""
     query_lower = query.lower()
+    return {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in DOMAIN_KEYWORDS.items()}
 
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
+def detect_domain(query):
+    """Auto-detect the most relevant domain from query"""
+    scores = _domain_keyword_hits(query)
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
+# Shared result cache for search(), search_stack() and search_all()
+RESULT_CACHE = ResultCache()
+
+
+def cache_stats():
+    """Hit/miss counters of the result cache"""
+    return RESULT_CACHE.stats()
+
+
+def search(query, domain=None, max_results=MAX_RESULTS, backend="python", fuzzy=None):
+    """
+    Main search function with auto-domain detection (backend: "python" or "numpy").
+    fuzzy=False disables query term expansion; None follows FUZZY_EXPANSION.
+    """
+    fuzzy = FUZZY_EXPANSION if fuzzy is None else fuzzy
+    key = RESULT_CACHE.key("search", query, domain, max_results, data_version(DATA_DIR), fuzzy)
+    cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        cached["query"] = query
+        return cached
+
     if domain is None:
         domain = detect_domain(query)
 
@@ -225,30 +623,41 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, backend,
+                          config.get("tokenizer"), fuzzy)
 
-    return {
+    result = {
         "domain": domain,
         "query": query,
         "file": config["file"],
         "count": len(results),
         "results": results
     }
+    RESULT_CACHE.put(key, result)
+    return result
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
+def search_stack(query, stack, max_results=MAX_RESULTS, backend="python", fuzzy=None):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
+    fuzzy = FUZZY_EXPANSION if fuzzy is None else fuzzy
+    key = RESULT_CACHE.key("stack", query, stack, max_results, data_version(DATA_DIR), fuzzy)
+    cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        cached["query"] = query
+        return cached
+
     filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
 
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, STACK_COLS["search_cols"], STACK_COLS["output_cols"], query, max_results, backend,
+                          STACK_COLS.get("tokenizer"), fuzzy)
 
-    return {
+    result = {
         "domain": "stack",
         "stack": stack,
         "query": query,
@@ -256,3 +665,201 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+    RESULT_CACHE.put(key, result)
+    return result
+
+
+def _target_config(target):
+    """Resolve a domain or "stack:<name>" target to (csv path, search cols, output cols, tokenizer)"""
+    if target.startswith("stack:"):
+        config = STACK_CONFIG.get(target[len("stack:"):])
+        if config is None:
+            return None
+        return DATA_DIR / config["file"], STACK_COLS["search_cols"], STACK_COLS["output_cols"], STACK_COLS.get("tokenizer")
+    config = CSV_CONFIG.get(target, CSV_CONFIG["style"])
+    return DATA_DIR / config["file"], config["search_cols"], config["output_cols"], config.get("tokenizer")
+
+
+def _warm_target(domain):
+    """Load the index behind a domain or "stack:<name>" target once"""
+    resolved = _target_config(domain)
+    if resolved and resolved[0].exists():
+        load_index(*resolved)
+
+
+def _run_jobs(jobs, backend, results, timings, fuzzy=None):
+    """Run (slot, query, domain, max_results) jobs of one target, filling results/timings by slot"""
+    for slot, query, domain, max_results in jobs:
+        start = time.perf_counter()
+        if domain.startswith("stack:"):
+            results[slot] = search_stack(query, domain[len("stack:"):], max_results, backend, fuzzy)
+        else:
+            results[slot] = search(query, domain, max_results, backend, fuzzy)
+        if timings is not None:
+            timings[slot] = (domain, (time.perf_counter() - start) * 1000)
+
+
+def _search_executor():
+    """Shared worker pool for parallel search_many calls, created on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _EXECUTOR = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="ui-pro-max-search")
+    return _EXECUTOR
+
+
+def search_many(queries, backend="python", parallel=False, timings=None, fuzzy=None):
+    """
+    Batch search over (query, domain, max_results) tuples.
+
+    domain may be None (auto-detect) or "stack:<name>" for stack guidelines;
+    max_results may be omitted. Queries are grouped by domain so each index is
+    fitted/loaded once and shared by all of its queries. Results are yielded
+    lazily in input order.
+
+    With parallel, each domain's group runs on a shared thread pool and the
+    results are yielded once all groups are done, still in input order.
+    A timings list, if given, receives one (domain, milliseconds) pair per
+    query in input order; the first query of a domain includes its index load.
+    fuzzy is passed to every search (see search()).
+    """
+    jobs = []
+    for slot, item in enumerate(queries):
+        query, domain, max_results = (tuple(item) + (None, None))[:3]
+        jobs.append((slot, query, domain or detect_domain(query),
+                     MAX_RESULTS if max_results is None else max_results))
+    results = [None] * len(jobs)
+    slots = [None] * len(jobs) if timings is not None else None
+
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job[2], []).append(job)
+
+    if parallel and len(groups) > 1:
+        executor = _search_executor()
+        for future in [executor.submit(_run_jobs, group, backend, results, slots, fuzzy) for group in groups.values()]:
+            future.result()
+        yield from results
+    else:
+        # Indexes load on first use and stay cached, so input order costs nothing
+        for job in jobs:
+            _run_jobs((job,), backend, results, slots, fuzzy)
+            yield results[job[0]]
+    if timings is not None:
+        timings.extend(slots)
+
+
+# ============ CROSS-DOMAIN SEARCH ============
+DOMAIN_BOOST = 1.0  # score multiplier added per keyword hit of the domain prior
+
+ALL_TARGETS = list(CSV_CONFIG) + [f"stack:{stack}" for stack in STACK_CONFIG]
+
+# Unified index cache: (source stamps) -> UnifiedIndex
+_UNIFIED_CACHE = {}
+
+
+class UnifiedIndex:
+    """
+    BM25 over every domain and stack CSV, with a target per document.
+
+    Targets sharing a token pipeline are merged into one model; a target
+    configured with a different "tokenizer" gets its own part so its terms
+    still match the query.
+    """
+
+    def __init__(self, targets):
+        self.targets = []   # [(target, file, SearchIndex)]
+        self.parts = []     # [(BM25, doc_target, doc_row)] per token pipeline
+        grouped = {}
+        for target in targets:
+            filepath, search_cols, output_cols, tokenizer = _target_config(target)
+            if not filepath.exists():
+                continue
+            index = load_index(filepath, search_cols, output_cols, tokenizer)
+            position = len(self.targets)
+            self.targets.append((target, filepath.relative_to(DATA_DIR).as_posix(), index))
+            models, doc_target, doc_row = grouped.setdefault(id(index.bm25.tokenizer), ([], [], []))
+            models.append(index.bm25)
+            doc_target.extend([position] * index.bm25.N)
+            doc_row.extend(range(index.bm25.N))
+        for models, doc_target, doc_row in grouped.values():
+            self.parts.append((BM25.merge(models), doc_target, doc_row))
+
+
+def load_unified_index():
+    """Return the cross-domain index, rebuilding it when any source CSV changed"""
+    stamps = []
+    for target in ALL_TARGETS:
+        filepath = _target_config(target)[0]
+        stamps.append(_source_stamp(filepath) if filepath.exists() else None)
+    key = tuple(stamps)
+    if key not in _UNIFIED_CACHE:
+        _UNIFIED_CACHE.clear()
+        _UNIFIED_CACHE[key] = UnifiedIndex(ALL_TARGETS)
+    return _UNIFIED_CACHE[key]
+
+
+def _target_prior(target, hits, query_lower):
+    """Keyword hits for a target; stacks count a hit when their name appears in the query"""
+    if target.startswith("stack:"):
+        return 1 if target[len("stack:"):] in query_lower else 0
+    return hits.get(target, 0)
+
+
+def search_all(query, max_results=MAX_RESULTS, max_domains=MAX_DOMAINS, fuzzy=None):
+    """
+    Rank one query across every domain and stack in a single pass.
+
+    The detect_domain keyword prior boosts scores instead of filtering, so a
+    wrong guess no longer hides the right CSV. Returns the top max_results
+    rows for each of the best max_domains targets, ordered by their best
+    boosted score. Expansion (see search()) applies only when no part of the
+    index knows any query term.
+    """
+    fuzzy = FUZZY_EXPANSION if fuzzy is None else fuzzy
+    key = RESULT_CACHE.key("all", query, None, max_results, data_version(DATA_DIR), max_domains, fuzzy)
+    cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        cached["query"] = query
+        return cached
+
+    unified = load_unified_index()
+    hits = _domain_keyword_hits(query)
+    query_lower = query.lower()
+    boosts = [1 + DOMAIN_BOOST * _target_prior(target, hits, query_lower) for target, _, _ in unified.targets]
+
+    if fuzzy:
+        fuzzy = not any(bm25.query_terms(query, fuzzy=False) for bm25, _, _ in unified.parts)
+    per_target = defaultdict(list)
+    for bm25, doc_target, doc_row in unified.parts:
+        for doc_id, score in bm25.score(query, fuzzy=fuzzy):
+            position = doc_target[doc_id]
+            per_target[position].append((score * boosts[position], doc_row[doc_id]))
+
+    ranked_targets = []
+    for position, scored in per_target.items():
+        top = heapq.nlargest(max_results, scored, key=lambda x: (x[0], -x[1]))
+        ranked_targets.append((top[0][0], position, top))
+    ranked_targets.sort(key=lambda x: (-x[0], x[1]))
+
+    domains = []
+    for _, position, top in ranked_targets[:max_domains]:
+        target, file, index = unified.targets[position]
+        entry = {"domain": "stack" if target.startswith("stack:") else target}
+        if target.startswith("stack:"):
+            entry["stack"] = target[len("stack:"):]
+        entry.update({
+            "file": file,
+            "count": len(top),
+            "results": index.rows_for([row for _, row in top])
+        })
+        domains.append(entry)
+
+    result = {
+        "domain": "all",
+        "query": query,
+        "count": sum(entry["count"] for entry in domains),
+        "domains": domains
+    }
+    RESULT_CACHE.put(key, result)
+    return result
@@ -11,14 +11,21 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Many projects and pages in one process (manifest: JSON or YAML)
+    summary = generate_from_manifest(load_manifest("projects.yaml"))
 """
 
 import csv
+import hashlib
 import json
 import os
+import re
+import time
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from cache import ResultCache, data_version
+from core import search, search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -32,64 +39,269 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Bump when the reasoning or best-match logic changes: generated design systems
+# are cached under (normalized query, REASONING_VERSION, data version)
+REASONING_VERSION = 1
+DESIGN_CACHE = ResultCache()
 
-# ============ DESIGN SYSTEM GENERATOR ============
-class DesignSystemGenerator:
-    """Generates design system recommendations from aggregated searches."""
+# Run the SEARCH_CONFIG domain searches on a thread pool (results keep SEARCH_CONFIG
+# order). Off by default: the searches are CPU-bound and serialize on the GIL.
+PARALLEL_SEARCH = False
+DESIGN_DISK_CACHE_FILE = Path(__file__).resolve().parents[3] / ".cache" / "ui-ux-pro-max-design.json"
+
+
+# ============ REASONING RULES ============
+# (path, mtime_ns, size) -> ReasoningIndex
+_REASONING_INDEXES = {}
+
+
+class _NeedleTable:
+    """
+    Strings with a position each, answering "first position whose string
+    occurs in text". Strings of 3+ chars are bucketed by their first trigram,
+    so only the buckets of the text's own trigrams are checked.
+    """
 
     def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+        self.short = {}     # needle (< 3 chars) -> first position
+        self.anchors = {}   # first trigram -> [(position, needle)]
 
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
+    def add(self, needle: str, position: int):
+        if len(needle) < 3:
+            self.short.setdefault(needle, position)
+        else:
+            self.anchors.setdefault(needle[:3], []).append((position, needle))
+
+    def first_in(self, text: str) -> int:
+        best = self.short.get("", -1)
+        if self.short:
+            for length in (1, 2):
+                for start in range(len(text) - length + 1):
+                    position = self.short.get(text[start:start + length])
+                    if position is not None and (best < 0 or position < best):
+                        best = position
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            for position, needle in self.anchors.get(gram, ()):
+                if (best < 0 or position < best) and needle in text:
+                    best = position
+        return best
+
+
+class ReasoningIndex:
+    """
+    Reasoning rules compiled for lookup by product category.
+
+    Reproduces the three passes of the original linear scan, each returning
+    the first rule (in CSV order) that matches:
+      1. exact:   UI_Category == category
+      2. partial: UI_Category in category, or category in UI_Category
+      3. keyword: any word of UI_Category (split on space, "/" and "-") in category
+    "X in category" is answered from trigram-bucketed needle tables and
+    "category in UI_Category" by intersecting trigram postings. Decision_Rules
+    JSON and Style_Priority are parsed once per rule.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.ui_cats = [(rule.get("UI_Category") or "").lower() for rule in rules]
+        self.exact = {}                      # ui_category -> first position
+        self.categories = _NeedleTable()     # ui_category, for "ui_category in category"
+        self.keywords = _NeedleTable()       # UI_Category words
+        self.trigrams = {}                   # trigram -> positions of UI_Categories containing it
+        self.parsed = []                     # position -> _apply_reasoning() result
+        for position, (rule, ui_cat) in enumerate(zip(rules, self.ui_cats)):
+            self.exact.setdefault(ui_cat, position)
+            self.categories.add(ui_cat, position)
+            for keyword in ui_cat.replace("/", " ").replace("-", " ").split():
+                self.keywords.add(keyword, position)
+            for i in range(len(ui_cat) - 2):
+                self.trigrams.setdefault(ui_cat[i:i + 3], set()).add(position)
+            self.parsed.append(self._parse(rule))
+
+    @staticmethod
+    def _parse(rule: dict) -> dict:
+        decision_rules = {}
+        try:
+            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
+        except json.JSONDecodeError:
+            pass
+        return {
+            "pattern": rule.get("Recommended_Pattern", ""),
+            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
+            "color_mood": rule.get("Color_Mood", ""),
+            "typography_mood": rule.get("Typography_Mood", ""),
+            "key_effects": rule.get("Key_Effects", ""),
+            "anti_patterns": rule.get("Anti_Patterns", ""),
+            "decision_rules": decision_rules,
+            "severity": rule.get("Severity", "MEDIUM")
+        }
+
+    def _contained_in(self, category_lower: str) -> int:
+        """First position whose UI_Category contains category_lower (or -1)."""
+        if len(category_lower) < 3:
+            candidates = range(len(self.ui_cats))
+        else:
+            candidates = None
+            for i in range(len(category_lower) - 2):
+                posting = self.trigrams.get(category_lower[i:i + 3])
+                if not posting:
+                    return -1
+                candidates = set(posting) if candidates is None else candidates & posting
+            candidates = sorted(candidates)
+        for position in candidates:
+            if category_lower in self.ui_cats[position]:
+                return position
+        return -1
+
+    def find(self, category: str) -> int:
+        """Position of the rule the linear scan would pick for category (or -1)."""
+        category_lower = category.lower()
+
+        position = self.exact.get(category_lower)
+        if position is not None:
+            return position
+
+        contains = self.categories.first_in(category_lower)
+        contained = self._contained_in(category_lower)
+        if contains >= 0 or contained >= 0:
+            return min(p for p in (contains, contained) if p >= 0)
+
+        return self.keywords.first_in(category_lower)
+
+    def rule(self, category: str) -> dict:
+        position = self.find(category)
+        return self.rules[position] if position >= 0 else {}
+
+    def reasoning(self, category: str):
+        """Pre-parsed reasoning for category, or None when no rule matches."""
+        position = self.find(category)
+        if position < 0:
+            return None
+        parsed = self.parsed[position]
+        # Callers get their own copies of the mutable parts
+        return dict(parsed, style_priority=list(parsed["style_priority"]),
+                    decision_rules=dict(parsed["decision_rules"]))
+
+
+def load_reasoning_index() -> ReasoningIndex:
+    """Compile the reasoning CSV once per file version."""
+    filepath = DATA_DIR / REASONING_FILE
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return ReasoningIndex([])
+    key = (str(filepath), stat.st_mtime_ns, stat.st_size)
+    index = _REASONING_INDEXES.get(key)
+    if index is None:
         with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+            index = ReasoningIndex(list(csv.DictReader(f)))
+        _REASONING_INDEXES.clear()
+        _REASONING_INDEXES[key] = index
+    return index
+
+
+# ============ JSON SCHEMA ============
+# Shape of DesignSystemGenerator.generate() results, as emitted by --format json/msgpack
+_TEXT = {"type": "string"}
+DESIGN_SYSTEM_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "title": "UI Pro Max design system",
+    "type": "object",
+    "required": ["project_name", "category", "pattern", "style", "colors", "typography",
+                 "key_effects", "anti_patterns", "decision_rules", "severity"],
+    "properties": {
+        "project_name": {"type": "string", "description": "Project name, or the upper-cased query"},
+        "category": {"type": "string", "description": "Matched product type (products.csv), or General"},
+        "pattern": {
+            "type": "object",
+            "description": "Landing page pattern (landing.csv)",
+            "properties": {
+                "name": _TEXT,
+                "sections": {"type": "string", "description": "Section order, '>'-separated"},
+                "cta_placement": _TEXT,
+                "color_strategy": _TEXT,
+                "conversion": _TEXT
+            }
+        },
+        "style": {
+            "type": "object",
+            "description": "Best matching UI style (styles.csv)",
+            "properties": {
+                "name": _TEXT, "type": _TEXT, "effects": _TEXT, "keywords": _TEXT,
+                "best_for": _TEXT, "performance": _TEXT, "accessibility": _TEXT
+            }
+        },
+        "colors": {
+            "type": "object",
+            "description": "Palette (colors.csv); colors are hex strings like #2563EB",
+            "properties": {
+                "primary": _TEXT, "secondary": _TEXT, "cta": _TEXT,
+                "background": _TEXT, "text": _TEXT, "notes": _TEXT
+            }
+        },
+        "typography": {
+            "type": "object",
+            "description": "Font pairing (typography.csv)",
+            "properties": {
+                "heading": _TEXT, "body": _TEXT, "mood": _TEXT, "best_for": _TEXT,
+                "google_fonts_url": _TEXT, "css_import": _TEXT
+            }
+        },
+        "key_effects": _TEXT,
+        "anti_patterns": {"type": "string", "description": "'+'-separated things to avoid"},
+        "decision_rules": {
+            "type": "object",
+            "description": "Condition -> action hints from ui-reasoning.csv",
+            "additionalProperties": {"type": "string"}
+        },
+        "severity": {"type": "string", "description": "HIGH, MEDIUM or LOW"}
+    }
+}
+OUTPUT_FORMATS = ("ascii", "markdown", "json")
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+
+# ============ DESIGN SYSTEM GENERATOR ============
+class DesignSystemGenerator:
+    """Generates design system recommendations from aggregated searches."""
+
+    def __init__(self):
+        self._reasoning = None
+
+    @property
+    def reasoning(self) -> ReasoningIndex:
+        """Compiled reasoning rules, loaded on first use (a cached generate() never needs them)."""
+        if self._reasoning is None:
+            self._reasoning = load_reasoning_index()
+        return self._reasoning
+
+    @property
+    def reasoning_data(self) -> list:
+        """Reasoning rules as read from the CSV."""
+        return self.reasoning.rules
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, timings: list = None) -> dict:
+        """Execute searches across multiple domains (timings receives (domain, ms) pairs)."""
+        batch = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                batch.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                batch.append((query, domain, config["max_results"]))
+        results = list(search_many(batch, parallel=PARALLEL_SEARCH, timings=timings, fuzzy=False))
+        return dict(zip(SEARCH_CONFIG, results))
 
     def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        """Find matching reasoning rule for a category (exact, then partial, then keyword match)."""
+        return self.reasoning.rule(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        reasoning = self.reasoning.reasoning(category)
 
-        if not rule:
+        if reasoning is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -100,24 +312,7 @@ class DesignSystemGenerator:
                 "decision_rules": {},
                 "severity": "MEDIUM"
             }
-
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
-        return {
-            "pattern": rule.get("Recommended_Pattern", ""),
-            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
-            "color_mood": rule.get("Color_Mood", ""),
-            "typography_mood": rule.get("Typography_Mood", ""),
-            "key_effects": rule.get("Key_Effects", ""),
-            "anti_patterns": rule.get("Anti_Patterns", ""),
-            "decision_rules": decision_rules,
-            "severity": rule.get("Severity", "MEDIUM")
-        }
+        return reasoning
 
     def _select_best_match(self, results: list, priority_keywords: list) -> dict:
         """Select best matching result based on priority keywords."""
@@ -160,10 +355,49 @@ class DesignSystemGenerator:
         """Extract results list from search result dict."""
         return search_result.get("results", [])
 
-    def generate(self, query: str, project_name: str = None) -> dict:
-        """Generate complete design system recommendation."""
+    def generate(self, query: str, project_name: str = None, profile: dict = None) -> dict:
+        """
+        Generate complete design system recommendation.
+
+        Results are memoized in DESIGN_CACHE, so asking for the same product
+        again (or persisting another page of it) skips every search. A profile
+        dict, if given, is filled with a timing breakdown (see _generate).
+        """
+        start = time.perf_counter()
+        key = DESIGN_CACHE.key("design_system", query, None, None, data_version(DATA_DIR), REASONING_VERSION)
+        design_system = DESIGN_CACHE.get(key)
+        if profile is not None:
+            profile["cached"] = design_system is not None
+        if design_system is None:
+            design_system = self._generate(query, profile)
+            DESIGN_CACHE.put(key, design_system)
+        design_system["project_name"] = project_name or query.upper()
+        if profile is not None:
+            profile["total_ms"] = (time.perf_counter() - start) * 1000
+        return design_system
+
+    def _generate(self, query: str, profile: dict = None) -> dict:
+        """
+        Run the searches and reasoning behind generate() (project name left unset).
+        Searches are exact (fuzzy=False): term expansion would change the rows
+        a design system is built from.
+
+        profile receives "steps" ((step, ms) pairs) and "domains" ((domain, ms)
+        pairs of the multi-domain search, in SEARCH_CONFIG order).
+        """
+        steps, domains = [], []
+        if profile is not None:
+            profile.update(steps=steps, domains=domains)
+        lap = time.perf_counter()
+
+        def mark(step):
+            nonlocal lap
+            now = time.perf_counter()
+            steps.append((step, (now - lap) * 1000))
+            lap = now
+
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = search(query, "product", 1, fuzzy=False)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -172,10 +406,12 @@ class DesignSystemGenerator:
         # Step 2: Get reasoning rules for this category
         reasoning = self._apply_reasoning(category, {})
         style_priority = reasoning.get("style_priority", [])
+        mark("product search + reasoning")
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        search_results = self._multi_domain_search(query, style_priority, domains)
         search_results["product"] = product_result  # Reuse product search
+        mark("multi-domain search")
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -187,6 +423,7 @@ class DesignSystemGenerator:
         best_color = color_results[0] if color_results else {}
         best_typography = typography_results[0] if typography_results else {}
         best_landing = landing_results[0] if landing_results else {}
+        mark("best-match selection")
 
         # Step 5: Build final recommendation
         # Combine effects from both reasoning and style search
@@ -195,7 +432,7 @@ class DesignSystemGenerator:
         combined_effects = style_effects if style_effects else reasoning_effects
 
         return {
-            "project_name": project_name or query.upper(),
+            "project_name": None,
             "category": category,
             "pattern": {
                 "name": best_landing.get("Pattern Name", reasoning.get("pattern", "Hero + Features + CTA")),
@@ -239,8 +476,8 @@ class DesignSystemGenerator:
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
 
-def format_ascii_box(design_system: dict) -> str:
-    """Format design system as ASCII box with emojis (MCP-style)."""
+def iter_ascii_box(design_system: dict):
+    """Yield the lines of format_ascii_box() one at a time."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -272,80 +509,79 @@ def format_ascii_box(design_system: dict) -> str:
     sections = [s.strip() for s in sections if s.strip()]
 
     # Build output lines
-    lines = []
     w = BOX_WIDTH - 1
 
-    lines.append("+" + "-" * w + "+")
-    lines.append(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
-    lines.append("+" + "-" * w + "+")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+    yield "+" + "-" * w + "+"
+    yield f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|"
+    yield "+" + "-" * w + "+"
+    yield "|" + " " * BOX_WIDTH + "|"
 
     # Pattern section
-    lines.append(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|"
     if pattern.get('conversion'):
-        lines.append(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
+        yield f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|"
     if pattern.get('cta_placement'):
-        lines.append(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append("|     Sections:".ljust(BOX_WIDTH) + "|")
+        yield f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|"
+    yield "|     Sections:".ljust(BOX_WIDTH) + "|"
     for i, section in enumerate(sections, 1):
-        lines.append(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield f"|       {i}. {section}".ljust(BOX_WIDTH) + "|"
+    yield "|" + " " * BOX_WIDTH + "|"
 
     # Style section
-    lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|"
     if style.get("keywords"):
         for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
     if style.get("best_for"):
         for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
     if style.get("performance") or style.get("accessibility"):
         perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|"
+    yield "|" + " " * BOX_WIDTH + "|"
 
     # Colors section
-    lines.append("|  COLORS:".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
+    yield "|  COLORS:".ljust(BOX_WIDTH) + "|"
+    yield f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|"
+    yield f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|"
+    yield f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|"
+    yield f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|"
+    yield f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|"
     if colors.get("notes"):
         for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
+    yield "|" + " " * BOX_WIDTH + "|"
 
     # Typography section
-    lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
+    yield f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|"
     if typography.get("mood"):
         for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
     if typography.get("best_for"):
         for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
     if typography.get("google_fonts_url"):
-        lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
+        yield f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|"
     if typography.get("css_import"):
-        lines.append(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|"
+    yield "|" + " " * BOX_WIDTH + "|"
 
     # Key Effects section
     if effects:
-        lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
+        yield "|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|"
         for line in wrap_text(effects, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
+        yield "|" + " " * BOX_WIDTH + "|"
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
+        yield "|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|"
         for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+            yield line.ljust(BOX_WIDTH) + "|"
+        yield "|" + " " * BOX_WIDTH + "|"
 
     # Pre-Delivery Checklist section
-    lines.append("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
+    yield "|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|"
     checklist_items = [
         "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
         "[ ] cursor-pointer on all clickable elements",
@@ -356,16 +592,19 @@ def format_ascii_box(design_system: dict) -> str:
         "[ ] Responsive: 375px, 768px, 1024px, 1440px"
     ]
     for item in checklist_items:
-        lines.append(f"|     {item}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield f"|     {item}".ljust(BOX_WIDTH) + "|"
+    yield "|" + " " * BOX_WIDTH + "|"
 
-    lines.append("+" + "-" * w + "+")
+    yield "+" + "-" * w + "+"
 
-    return "\n".join(lines)
 
+def format_ascii_box(design_system: dict) -> str:
+    """Format design system as ASCII box with emojis (MCP-style)."""
+    return "\n".join(iter_ascii_box(design_system))
 
-def format_markdown(design_system: dict) -> str:
-    """Format design system as markdown."""
+
+def iter_markdown(design_system: dict):
+    """Yield the lines of format_markdown() one at a time."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -374,173 +613,376 @@ def format_markdown(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
+    yield f"## Design System: {project}"
+    yield ""
 
     # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
+    yield "### Pattern"
+    yield f"- **Name:** {pattern.get('name', '')}"
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Focus:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
     if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **Color Strategy:** {pattern.get('color_strategy', '')}"
+    yield f"- **Sections:** {pattern.get('sections', '')}"
+    yield ""
 
     # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
+    yield "### Style"
+    yield f"- **Name:** {style.get('name', '')}"
     if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
+        yield f"- **Keywords:** {style.get('keywords', '')}"
     if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
+        yield f"- **Best For:** {style.get('best_for', '')}"
     if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
+        yield f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}"
+    yield ""
 
     # Colors section
-    lines.append("### Colors")
-    lines.append(f"| Role | Hex |")
-    lines.append(f"|------|-----|")
-    lines.append(f"| Primary | {colors.get('primary', '')} |")
-    lines.append(f"| Secondary | {colors.get('secondary', '')} |")
-    lines.append(f"| CTA | {colors.get('cta', '')} |")
-    lines.append(f"| Background | {colors.get('background', '')} |")
-    lines.append(f"| Text | {colors.get('text', '')} |")
+    yield "### Colors"
+    yield f"| Role | Hex |"
+    yield f"|------|-----|"
+    yield f"| Primary | {colors.get('primary', '')} |"
+    yield f"| Secondary | {colors.get('secondary', '')} |"
+    yield f"| CTA | {colors.get('cta', '')} |"
+    yield f"| Background | {colors.get('background', '')} |"
+    yield f"| Text | {colors.get('text', '')} |"
     if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
+        yield f"\n*Notes: {colors.get('notes', '')}*"
+    yield ""
 
     # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
+    yield "### Typography"
+    yield f"- **Heading:** {typography.get('heading', '')}"
+    yield f"- **Body:** {typography.get('body', '')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
+        yield f"- **Best For:** {typography.get('best_for', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
+        yield f"- **Google Fonts:** {typography.get('google_fonts_url', '')}"
     if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
+        yield f"- **CSS Import:**"
+        yield f"```css"
+        yield f"{typography.get('css_import', '')}"
+        yield f"```"
+    yield ""
 
     # Key Effects section
     if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
+        yield "### Key Effects"
+        yield f"{effects}"
+        yield ""
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
+        yield "### Avoid (Anti-patterns)"
         newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
+        yield f"- {anti_patterns.replace(' + ', newline_bullet)}"
+        yield ""
 
     # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
+    yield "### Pre-Delivery Checklist"
+    yield "- [ ] No emojis as icons (use SVG: Heroicons/Lucide)"
+    yield "- [ ] cursor-pointer on all clickable elements"
+    yield "- [ ] Hover states with smooth transitions (150-300ms)"
+    yield "- [ ] Light mode: text contrast 4.5:1 minimum"
+    yield "- [ ] Focus states visible for keyboard nav"
+    yield "- [ ] prefers-reduced-motion respected"
+    yield "- [ ] Responsive: 375px, 768px, 1024px, 1440px"
+    yield ""
 
-    return "\n".join(lines)
+
+def format_markdown(design_system: dict) -> str:
+    """Format design system as markdown."""
+    return "\n".join(iter_markdown(design_system))
 
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           profile: dict = None, stream=None) -> str:
     """
     Main entry point for design system generation.
 
     Args:
         query: Search query (e.g., "SaaS dashboard", "e-commerce luxury")
         project_name: Optional project name for output header
-        output_format: "ascii" (default) or "markdown"
+        output_format: "ascii" (default), "markdown" or "json" (see DESIGN_SYSTEM_SCHEMA)
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        profile: Optional dict filled with a timing breakdown of the generation
+        stream: Optional text stream; lines are written to it as they are rendered
 
     Returns:
-        Formatted design system string
+        Formatted design system string ("" when written to stream)
     """
     generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    design_system = generator.generate(query, project_name, profile)
     
     # Persist to files if requested
     if persist:
         persist_design_system(design_system, page, output_dir, query)
 
+    lines = render_design_system(design_system, output_format)
+    if stream is not None:
+        write_lines(lines, stream)
+        return ""
+    return "\n".join(lines)
+
+
+def render_design_system(design_system: dict, output_format: str = "ascii"):
+    """Lines of a design system in the given output format, rendered lazily."""
+    if output_format == "json":
+        # One compact line: the generate() dict, described by DESIGN_SYSTEM_SCHEMA
+        return iter([json.dumps(design_system, ensure_ascii=False, separators=(",", ":"))])
     if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+        return iter_markdown(design_system)
+    return iter_ascii_box(design_system)
+
+
+def write_lines(lines, stream):
+    """Write rendered lines to a text stream as they are produced (the text print() of the joined lines gives)."""
+    write = stream.write
+    for line in lines:
+        write(line)
+        write("\n")
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+WRITE_BUFFER_SIZE = 1 << 16
+# Bump when format_master_md / format_page_override_md change what they render
+PERSIST_FORMAT_VERSION = 1
+PERSIST_MANIFEST = ".persist-manifest.json"
+# The "Generated:" timestamp line changes on every render; it is left out of content hashes
+_TIMESTAMP_LINE_RE = re.compile(r"^(?:> )?\*\*Generated:\*\* .*$", re.MULTILINE)
+
+
+def _slug(name: str) -> str:
+    return name.lower().replace(' ', '-')
+
+
+def _write_file(path: Path, content: str):
+    """Write a rendered file in one buffered write."""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(content)
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha1(_TIMESTAMP_LINE_RE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _load_persist_manifest(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _persist_file(path: Path, entry_key: str, manifest: dict, inputs: str, render, record: dict) -> bool:
+    """
+    Write one rendered file unless nothing about it changed; returns True if written.
+
+    When the recorded inputs match and the file still has its recorded size
+    and mtime, rendering is skipped entirely. Otherwise the file is rendered
+    and written only if its content (timestamp line aside) differs from what
+    is on disk, so unchanged files keep their mtime.
+    """
+    entry = manifest.get(entry_key)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        stat = None
+    if entry and stat and entry.get("inputs") == inputs and \
+            entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        return False
+
+    content = render()
+    digest = _content_hash(content)
+    written = True
+    if stat:
+        if entry and entry.get("sha1") == digest and entry.get("mtime_ns") == stat.st_mtime_ns \
+                and entry.get("size") == stat.st_size:
+            written = False
+        else:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    written = _content_hash(f.read()) != digest
+            except (OSError, UnicodeDecodeError):
+                pass
+    if written:
+        _write_file(path, content)
+        stat = path.stat()
+    manifest[entry_key] = dict(record, inputs=inputs, sha1=digest, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    return written
+
+
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
+
+    Files whose rendered content is unchanged are not rewritten. A manifest
+    (design-system/<project>/.persist-manifest.json) records the query and
+    data version that produced each file.
     
     Args:
         design_system: The generated design system dictionary
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of (page, page_query) pairs, each written like page
     
     Returns:
-        dict with created file paths and status
+        dict with created file paths (written or already up to date) and status
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
     project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
+    project_slug = _slug(project_name)
     
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
     
     created_files = []
+    written_files = []
     
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
-    
+
+    manifest_path = design_system_dir / PERSIST_MANIFEST
+    manifest = _load_persist_manifest(manifest_path)
+    previous = json.dumps(manifest, sort_keys=True)
+    version = data_version(DATA_DIR)
+    state = json.dumps([PERSIST_FORMAT_VERSION, REASONING_VERSION, version, design_system], sort_keys=True)
+
+    def inputs(*parts):
+        return hashlib.sha1(json.dumps([state, *parts]).encode("utf-8")).hexdigest()
+
+    # MASTER.md
     master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    if _persist_file(master_file, "MASTER.md", manifest, inputs("MASTER.md"),
+                     lambda: format_master_md(design_system),
+                     {"query": page_query, "data_version": version}):
+        written_files.append(str(master_file))
     created_files.append(str(master_file))
     
-    # If page is specified, create page override file with intelligent content
+    # Page override files with intelligent content
+    page_specs = list(pages or [])
     if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+        page_specs.insert(0, (page, page_query))
+    for page_name, query in page_specs:
+        page_file = pages_dir / f"{_slug(page_name)}.md"
+        entry_key = f"pages/{page_file.name}"
+        if _persist_file(page_file, entry_key, manifest, inputs(entry_key, page_name, query),
+                         lambda: format_page_override_md(design_system, page_name, query),
+                         {"query": query, "page": page_name, "data_version": version}):
+            written_files.append(str(page_file))
         created_files.append(str(page_file))
+
+    if json.dumps(manifest, sort_keys=True) != previous:
+        _write_file(manifest_path, json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "written_files": written_files
     }
 
 
-def format_master_md(design_system: dict) -> str:
-    """Format design system as MASTER.md with hierarchical override logic."""
+# ============ MANIFEST (BULK) GENERATION ============
+def load_manifest(path: str) -> dict:
+    """
+    Read a bulk-generation manifest (JSON, or YAML when PyYAML is installed).
+
+    Accepted shapes: a list of projects, or {"output_dir": ..., "projects": [...]}.
+    Each project is {"query": ..., "name": ..., "pages": [...]} where a page is a
+    name or {"name": ..., "query": ...}; a page without a query uses the project's.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); use JSON instead")
+        manifest = yaml.safe_load(text)
+    else:
+        manifest = json.loads(text)
+
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+        raise ValueError(f"{path}: expected a list of projects or a mapping with a 'projects' list")
+    for i, project in enumerate(manifest["projects"]):
+        if not isinstance(project, dict) or not _is_text(project.get("query")):
+            raise ValueError(f"{path}: project #{i + 1} needs a 'query'")
+        if "name" in project and not _is_text(project["name"]):
+            raise ValueError(f"{path}: project #{i + 1} 'name' must be a non-empty string")
+        pages = project.get("pages") or []
+        if not isinstance(pages, list):
+            raise ValueError(f"{path}: project #{i + 1} 'pages' must be a list")
+        for j, page in enumerate(pages):
+            name = page.get("name") if isinstance(page, dict) else page
+            if not _is_text(name):
+                raise ValueError(f"{path}: project #{i + 1} page #{j + 1} needs a non-empty string 'name'")
+            if isinstance(page, dict) and page.get("query") is not None and not _is_text(page["query"]):
+                raise ValueError(f"{path}: project #{i + 1} page #{j + 1} 'query' must be a non-empty string")
+    return manifest
+
+
+def _is_text(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def generate_from_manifest(manifest: dict, output_dir: str = None) -> dict:
+    """
+    Generate and persist every project and page of a manifest in one process.
+
+    Fitted indexes, design systems and page-override searches are shared
+    between projects, so pages repeated across projects cost one search.
+
+    Returns:
+        dict with per-project created files and totals
+    """
+    output_dir = output_dir or manifest.get("output_dir")
+    generator = DesignSystemGenerator()
+    projects = []
+    for project in manifest["projects"]:
+        query = project["query"]
+        design_system = generator.generate(query, project.get("name"))
+        pages = []
+        for page in project.get("pages") or []:
+            if isinstance(page, dict):
+                pages.append((page["name"], page.get("query") or query))
+            else:
+                pages.append((page, query))
+        persisted = persist_design_system(design_system, output_dir=project.get("output_dir") or output_dir,
+                                          page_query=query, pages=pages)
+        projects.append({
+            "project": design_system["project_name"],
+            "query": query,
+            "design_system_dir": persisted["design_system_dir"],
+            "created_files": persisted["created_files"],
+            "written_files": persisted["written_files"]
+        })
+    return {
+        "status": "success",
+        "projects": projects,
+        "files": sum(len(p["created_files"]) for p in projects),
+        "written": sum(len(p["written_files"]) for p in projects)
+    }
+
+
+def iter_master_md(design_system: dict):
+    """Yield the lines of format_master_md() one at a time."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -551,259 +993,261 @@ def format_master_md(design_system: dict) -> str:
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    lines = []
     
     # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    yield "# Design System Master File"
+    yield ""
+    yield "> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`."
+    yield "> If that file exists, its rules **override** this Master file."
+    yield "> If not, strictly follow the rules below."
+    yield ""
+    yield "---"
+    yield ""
+    yield f"**Project:** {project}"
+    yield f"**Generated:** {timestamp}"
+    yield f"**Category:** {design_system.get('category', 'General')}"
+    yield ""
+    yield "---"
+    yield ""
     
     # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
+    yield "## Global Rules"
+    yield ""
     
     # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
+    yield "### Color Palette"
+    yield ""
+    yield "| Role | Hex | CSS Variable |"
+    yield "|------|-----|--------------|"
+    yield f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |"
+    yield f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |"
+    yield f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |"
+    yield f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |"
+    yield f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |"
+    yield ""
     if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
+        yield f"**Color Notes:** {colors.get('notes', '')}"
+        yield ""
     
     # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
+    yield "### Typography"
+    yield ""
+    yield f"- **Heading Font:** {typography.get('heading', 'Inter')}"
+    yield f"- **Body Font:** {typography.get('body', 'Inter')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
+        yield f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})"
+    yield ""
     if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
+        yield "**CSS Import:**"
+        yield "```css"
+        yield typography.get("css_import", "")
+        yield "```"
+        yield ""
     
     # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
+    yield "### Spacing Variables"
+    yield ""
+    yield "| Token | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--space-xs` | `4px` / `0.25rem` | Tight gaps |"
+    yield "| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |"
+    yield "| `--space-md` | `16px` / `1rem` | Standard padding |"
+    yield "| `--space-lg` | `24px` / `1.5rem` | Section padding |"
+    yield "| `--space-xl` | `32px` / `2rem` | Large gaps |"
+    yield "| `--space-2xl` | `48px` / `3rem` | Section margins |"
+    yield "| `--space-3xl` | `64px` / `4rem` | Hero padding |"
+    yield ""
     
     # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
+    yield "### Shadow Depths"
+    yield ""
+    yield "| Level | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |"
+    yield "| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |"
+    yield "| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |"
+    yield "| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |"
+    yield ""
     
     # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Component Specs"
+    yield ""
     
     # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Buttons"
+    yield ""
+    yield "```css"
+    yield "/* Primary Button */"
+    yield ".btn-primary {"
+    yield f"  background: {colors.get('cta', '#F97316')};"
+    yield "  color: white;"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".btn-primary:hover {"
+    yield "  opacity: 0.9;"
+    yield "  transform: translateY(-1px);"
+    yield "}"
+    yield ""
+    yield "/* Secondary Button */"
+    yield ".btn-secondary {"
+    yield f"  background: transparent;"
+    yield f"  color: {colors.get('primary', '#2563EB')};"
+    yield f"  border: 2px solid {colors.get('primary', '#2563EB')};"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Cards"
+    yield ""
+    yield "```css"
+    yield ".card {"
+    yield f"  background: {colors.get('background', '#FFFFFF')};"
+    yield "  border-radius: 12px;"
+    yield "  padding: 24px;"
+    yield "  box-shadow: var(--shadow-md);"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".card:hover {"
+    yield "  box-shadow: var(--shadow-lg);"
+    yield "  transform: translateY(-2px);"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Inputs"
+    yield ""
+    yield "```css"
+    yield ".input {"
+    yield "  padding: 12px 16px;"
+    yield "  border: 1px solid #E2E8F0;"
+    yield "  border-radius: 8px;"
+    yield "  font-size: 16px;"
+    yield "  transition: border-color 200ms ease;"
+    yield "}"
+    yield ""
+    yield ".input:focus {"
+    yield f"  border-color: {colors.get('primary', '#2563EB')};"
+    yield "  outline: none;"
+    yield f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Modals"
+    yield ""
+    yield "```css"
+    yield ".modal-overlay {"
+    yield "  background: rgba(0, 0, 0, 0.5);"
+    yield "  backdrop-filter: blur(4px);"
+    yield "}"
+    yield ""
+    yield ".modal {"
+    yield "  background: white;"
+    yield "  border-radius: 16px;"
+    yield "  padding: 32px;"
+    yield "  box-shadow: var(--shadow-xl);"
+    yield "  max-width: 500px;"
+    yield "  width: 90%;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Style Guidelines"
+    yield ""
+    yield f"**Style:** {style.get('name', 'Minimalism')}"
+    yield ""
     if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
+        yield f"**Keywords:** {style.get('keywords', '')}"
+        yield ""
     if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
+        yield f"**Best For:** {style.get('best_for', '')}"
+        yield ""
     if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
+        yield f"**Key Effects:** {effects}"
+        yield ""
     
     # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
+    yield "### Page Pattern"
+    yield ""
+    yield f"**Pattern Name:** {pattern.get('name', '')}"
+    yield ""
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Strategy:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
+    yield f"- **Section Order:** {pattern.get('sections', '')}"
+    yield ""
     
     # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Anti-Patterns (Do NOT Use)"
+    yield ""
     if anti_patterns:
         anti_list = [a.strip() for a in anti_patterns.split("+")]
         for anti in anti_list:
             if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
+                yield f"- ❌ {anti}"
+    yield ""
+    yield "### Additional Forbidden Patterns"
+    yield ""
+    yield "- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)"
+    yield "- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer"
+    yield "- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout"
+    yield "- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio"
+    yield "- ❌ **Instant state changes** — Always use transitions (150-300ms)"
+    yield "- ❌ **Invisible focus states** — Focus states must be visible for a11y"
+    yield ""
     
     # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+    yield "---"
+    yield ""
+    yield "## Pre-Delivery Checklist"
+    yield ""
+    yield "Before delivering any UI code, verify:"
+    yield ""
+    yield "- [ ] No emojis used as icons (use SVG instead)"
+    yield "- [ ] All icons from consistent icon set (Heroicons/Lucide)"
+    yield "- [ ] `cursor-pointer` on all clickable elements"
+    yield "- [ ] Hover states with smooth transitions (150-300ms)"
+    yield "- [ ] Light mode: text contrast 4.5:1 minimum"
+    yield "- [ ] Focus states visible for keyboard navigation"
+    yield "- [ ] `prefers-reduced-motion` respected"
+    yield "- [ ] Responsive: 375px, 768px, 1024px, 1440px"
+    yield "- [ ] No content hidden behind fixed navbars"
+    yield "- [ ] No horizontal scroll on mobile"
+    yield ""
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
-    """Format a page-specific override file with intelligent AI-generated content."""
+def format_master_md(design_system: dict) -> str:
+    """Format design system as MASTER.md with hierarchical override logic."""
+    return "\n".join(iter_master_md(design_system))
+
+
+def iter_page_override_md(design_system: dict, page_name: str, page_query: str = None):
+    """Yield the lines of format_page_override_md() one at a time."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
@@ -811,104 +1255,106 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     # Detect page type and generate intelligent overrides
     page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
     
-    lines = []
     
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    yield f"# {page_title} Page Overrides"
+    yield ""
+    yield f"> **PROJECT:** {project}"
+    yield f"> **Generated:** {timestamp}"
+    yield f"> **Page Type:** {page_overrides.get('page_type', 'General')}"
+    yield ""
+    yield "> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`)."
+    yield "> Only deviations from the Master are documented here. For all other rules, refer to the Master."
+    yield ""
+    yield "---"
+    yield ""
     
     # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
+    yield "## Page-Specific Rules"
+    yield ""
     
     # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
+    yield "### Layout Overrides"
+    yield ""
     layout = page_overrides.get("layout", {})
     if layout:
         for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
+        yield "- No overrides — use Master layout"
+    yield ""
     
     # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
+    yield "### Spacing Overrides"
+    yield ""
     spacing = page_overrides.get("spacing", {})
     if spacing:
         for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
+        yield "- No overrides — use Master spacing"
+    yield ""
     
     # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
+    yield "### Typography Overrides"
+    yield ""
     typography = page_overrides.get("typography", {})
     if typography:
         for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
+        yield "- No overrides — use Master typography"
+    yield ""
     
     # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
+    yield "### Color Overrides"
+    yield ""
     colors = page_overrides.get("colors", {})
     if colors:
         for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
+            yield f"- **{key}:** {value}"
     else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
+        yield "- No overrides — use Master colors"
+    yield ""
     
     # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
+    yield "### Component Overrides"
+    yield ""
     components = page_overrides.get("components", [])
     if components:
         for comp in components:
-            lines.append(f"- {comp}")
+            yield f"- {comp}"
     else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
+        yield "- No overrides — use Master component specs"
+    yield ""
     
     # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Page-Specific Components"
+    yield ""
     unique_components = page_overrides.get("unique_components", [])
     if unique_components:
         for comp in unique_components:
-            lines.append(f"- {comp}")
+            yield f"- {comp}"
     else:
-        lines.append("- No unique components for this page")
-    lines.append("")
+        yield "- No unique components for this page"
+    yield ""
     
     # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Recommendations"
+    yield ""
     recommendations = page_overrides.get("recommendations", [])
     if recommendations:
         for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+            yield f"- {rec}"
+    yield ""
+
+
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+    """Format a page-specific override file with intelligent AI-generated content."""
+    return "\n".join(iter_page_override_md(design_system, page_name, page_query))
 
 
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
@@ -916,18 +1362,30 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Generate intelligent overrides based on page type using layered search.
     
     Uses the existing search infrastructure to find relevant style, UX, and layout
-    data instead of hardcoded page types.
+    data instead of hardcoded page types. Overrides depend only on the page name
+    and query, so they are memoized in DESIGN_CACHE.
     """
-    from core import search
-    
+    key = DESIGN_CACHE.key("page_overrides", page_name, None, None, data_version(DATA_DIR), REASONING_VERSION,
+                           (page_query or "").lower())
+    overrides = DESIGN_CACHE.get(key)
+    if overrides is None:
+        overrides = _build_intelligent_overrides(page_name, page_query)
+        DESIGN_CACHE.put(key, overrides)
+    return overrides
+
+
+def _build_intelligent_overrides(page_name: str, page_query: str) -> dict:
+    """Run the page-context searches behind _generate_intelligent_overrides."""
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search, ux_search, landing_search = search_many([
+        (combined_context, "style", 1),
+        (combined_context, "ux", 3),
+        (combined_context, "landing", 1),
+    ], fuzzy=False)
     
     # Extract results from search response
     style_results = style_search.get("results", [])
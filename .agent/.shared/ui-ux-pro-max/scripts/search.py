@@ -5,18 +5,96 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --format json     # or msgpack; schema: --schema
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
 
+Without --domain/--stack the query is ranked across every domain and stack
+in one pass and the best --max-domains groups are returned.
+
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Bulk design systems (every MASTER.md and pages/*.md of a JSON/YAML manifest in one process):
+  python search.py --manifest projects.yaml [-o out/]
+  projects.yaml:  - {name: "My App", query: "saas dashboard", pages: [dashboard, settings, {name: checkout, query: "payment form"}]}
+
+Batch mode (one JSON object per line: {"query": ..., "domain"|"stack": ..., "max_results": ...}):
+  python search.py --batch queries.jsonl     # results stream back as JSON lines ("-" reads stdin)
+
+Output budget (most important fields of the best results first, per domain "field_priority" in config.py):
+  python search.py "<query>" --budget 1500      # bytes; "--budget 400t" estimates tokens at 4 bytes each
+
+Result cache (repeated queries are answered from an LRU cache, invalidated when any CSV changes):
+  --disk-cache   Also keep results in .agent/.cache/ across runs (or set UI_PRO_MAX_DISK_CACHE=1)
+  Generated design systems are cached the same way, per query and reasoning-rule version.
+  --cache-stats  Print cache hit/miss counters to stderr (of the daemon, when one answers)
+
+Daemon mode (indexes stay hot between calls):
+  python search.py --serve [--port 47863]
+  Every other invocation asks a running daemon first and falls back to
+  in-process search when none is listening (disable with --no-daemon).
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import os
+import sys
+from config import CSV_CONFIG, AVAILABLE_STACKS, BACKENDS, DAEMON_PORT, MAX_DOMAINS, MAX_RESULTS, STACK_COLS
+
+# The search engine (core), design_system and server are imported where they
+# are used: a call answered by the daemon never loads the engine, --no-daemon
+# never loads the socket client, and a plain domain or stack search never
+# loads design_system.
+
+
+FIELD_MAX_CHARS = 300      # longest field value printed before it is cut with "..."
+TOKEN_BYTES = 4            # bytes per token when --budget is given in tokens ("500t")
+MIN_TRUNCATED_BYTES = 60   # a field is only cut to fit the budget if this much of it still fits
+MIN_BUDGET_BYTES = 256     # smallest --budget: the header and budget line must fit with room to spare
+
+
+def _clip(value, limit=FIELD_MAX_CHARS):
+    value_str = str(value)
+    if len(value_str) > limit:
+        value_str = value_str[:limit] + "..."
+    return value_str
+
+
+def _format_rows(output, rows, heading="###"):
+    """Append one block per result row, truncating long fields"""
+    for i, row in enumerate(rows, 1):
+        output.append(f"{heading} Result {i}")
+        for key, value in row.items():
+            output.append(f"- **{key}:** {_clip(value)}")
+        output.append("")
+
+
+def _header_lines(result):
+    """Lines printed above the result blocks"""
+    if "domains" in result:
+        return [
+            f"## UI Pro Max Search Results",
+            f"**Domain:** all (ranked across domains) | **Query:** {result['query']}",
+            f"**Found:** {result['count']} results in {len(result['domains'])} domains\n"
+        ]
+    if result.get("stack"):
+        lines = [f"## UI Pro Max Stack Guidelines", f"**Stack:** {result['stack']} | **Query:** {result['query']}"]
+    else:
+        lines = [f"## UI Pro Max Search Results", f"**Domain:** {result['domain']} | **Query:** {result['query']}"]
+    lines.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
+    return lines
+
+
+def _budget_line(budget):
+    return (f"_Budget: {budget['used_bytes']}/{budget['limit_bytes']} bytes, "
+            f"{budget['omitted_fields']} fields omitted, {budget['truncated_fields']} truncated_")
+
+
+def _group_label(group):
+    return f"stack {group['stack']}" if group.get("stack") else group["domain"]
 
 
 def format_output(result):
@@ -24,83 +102,351 @@ def format_output(result):
     if "error" in result:
         return f"Error: {result['error']}"
 
-    output = []
-    if result.get("stack"):
-        output.append(f"## UI Pro Max Stack Guidelines")
-        output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
+    output = _header_lines(result)
+    if "domains" in result:
+        for group in result["domains"]:
+            output.append(f"### {_group_label(group)} ({group['file']})")
+            _format_rows(output, group["results"], "####")
     else:
-        output.append(f"## UI Pro Max Search Results")
-        output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
-    output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
-
-    for i, row in enumerate(result['results'], 1):
-        output.append(f"### Result {i}")
-        for key, value in row.items():
-            value_str = str(value)
-            if len(value_str) > 300:
-                value_str = value_str[:300] + "..."
-            output.append(f"- **{key}:** {value_str}")
-        output.append("")
+        _format_rows(output, result['results'])
+    if result.get("budget"):
+        output.append(_budget_line(result["budget"]))
 
     return "\n".join(output)
 
 
+# ============ BUDGETED OUTPUT ============
+def parse_budget(text):
+    """--budget value in bytes: "2000" is bytes, "500t" is an estimated 500 tokens"""
+    text = str(text).strip().lower()
+    try:
+        if text.endswith("t"):
+            budget = int(text[:-1]) * TOKEN_BYTES
+        else:
+            budget = int(text[:-1] if text.endswith("b") else text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid budget {text!r} (bytes, or tokens with a 't' suffix)")
+    if budget < MIN_BUDGET_BYTES:
+        raise argparse.ArgumentTypeError(f"budget must be at least {MIN_BUDGET_BYTES} bytes")
+    return budget
+
+
+def _field_priority(group):
+    """Priority order of a result group's fields (declared per domain in CSV_CONFIG)"""
+    config = STACK_COLS if group.get("stack") else CSV_CONFIG.get(group.get("domain"), {})
+    return config.get("field_priority") or config.get("output_cols") or []
+
+
+def _nbytes(line):
+    return len(line.encode("utf-8")) + 1  # + newline
+
+
+def shape_result(result, budget_bytes):
+    """
+    Fit a search result into roughly budget_bytes of format_output text.
+
+    Fields are added greedily: every result's most important field (per the
+    domain's "field_priority") first, in rank order, then every result's
+    second field, and so on. A field that no longer fits is cut with "..."
+    when at least MIN_TRUNCATED_BYTES of it still fit, otherwise skipped.
+    Results that end up with no field are dropped. The header and the
+    closing budget line always print, so they are charged first; a query
+    too long for them is echoed cut with "...". The returned copy keeps the
+    result's shape and gains a "budget" summary whose used_bytes is the
+    exact size of its format_output text, newline included.
+    """
+    if "error" in result:
+        return result
+
+    multi = "domains" in result
+    groups = result["domains"] if multi else [result]
+    heading = "####" if multi else "###"
+
+    # (priority, rank, group position, column) in fill order
+    candidates = []
+    for g, group in enumerate(groups):
+        priority = _field_priority(group)
+        for rank, row in enumerate(group["results"]):
+            for column in row:
+                order = priority.index(column) if column in priority else len(priority)
+                candidates.append((order, rank, g, column))
+    candidates.sort()
+
+    # Header and budget line at their widest: counts only shrink while shaping
+    reserve = _nbytes(_budget_line({"used_bytes": budget_bytes, "limit_bytes": budget_bytes,
+                                    "omitted_fields": len(candidates), "truncated_fields": len(candidates)}))
+
+    def fixed_bytes(query):
+        return reserve + sum(_nbytes(line) for line in _header_lines({**result, "query": query}))
+
+    query = result["query"]
+    if fixed_bytes(query) > budget_bytes:
+        room = budget_bytes - fixed_bytes("...")
+        if room < 0:
+            raise ValueError(f"a budget of {budget_bytes} bytes cannot hold the result header")
+        query = query.encode("utf-8")[:room].decode("utf-8", "ignore") + "..."
+    used = fixed_bytes(query)
+
+    chosen = {}  # (group, rank) -> {column: value}
+    opened_groups = set()
+    omitted = truncated = 0
+    for _, rank, g, column in candidates:
+        fields = chosen.get((g, rank))
+        overhead = 0
+        if fields is None:
+            overhead += _nbytes(f"{heading} Result {rank + 1}") + _nbytes("")
+            if multi and g not in opened_groups:
+                group = groups[g]
+                overhead += _nbytes(f"### {_group_label(group)} ({group['file']})")
+        value = _clip(groups[g]["results"][rank][column])
+        prefix = f"- **{column}:** "
+        cost = overhead + _nbytes(prefix + value)
+        if used + cost > budget_bytes:
+            room = budget_bytes - used - overhead - _nbytes(prefix + "...")
+            if room < MIN_TRUNCATED_BYTES:
+                omitted += 1
+                continue
+            value = value.encode("utf-8")[:room].decode("utf-8", "ignore") + "..."
+            cost = overhead + _nbytes(prefix + value)
+            truncated += 1
+        used += cost
+        if fields is None:
+            fields = chosen[(g, rank)] = {}
+            opened_groups.add(g)
+        fields[column] = value
+
+    shaped_groups = []
+    for g, group in enumerate(groups):
+        priority = _field_priority(group)
+        rows = []
+        for rank in range(len(group["results"])):
+            fields = chosen.get((g, rank))
+            if fields:
+                rows.append({column: fields[column] for column in
+                             sorted(fields, key=lambda c: priority.index(c) if c in priority else len(priority))})
+        shaped_groups.append({**group, "results": rows, "count": len(rows)})
+
+    budget = {"limit_bytes": budget_bytes, "used_bytes": 0, "omitted_fields": omitted, "truncated_fields": truncated}
+    if multi:
+        shaped_groups = [group for group in shaped_groups if group["results"]]
+        shaped = {**result, "query": query, "domains": shaped_groups,
+                  "count": sum(group["count"] for group in shaped_groups), "budget": budget}
+    else:
+        shaped = {**shaped_groups[0], "query": query, "budget": budget}
+
+    # used_bytes is printed inside the text it measures: settle its digit count
+    size = None
+    while budget["used_bytes"] != size:
+        size = budget["used_bytes"]
+        budget["used_bytes"] = _nbytes(format_output(shaped))
+    return shaped
+
+
+def run_batch(path, backend="python"):
+    """Stream JSON-lines results for a JSON-lines file of queries"""
+    from core import search_many
+    source = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    with source:
+        jobs = []
+        for line in source:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            domain = f"stack:{item['stack']}" if item.get("stack") else item.get("domain")
+            jobs.append((item["query"], domain, item.get("max_results")))
+
+    for result in search_many(jobs, backend):
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+def _via_daemon(args, payload):
+    """Answer a request through the search daemon, or None to search in-process"""
+    if args.no_daemon:
+        return None
+    import server
+    response = server.request(payload, port=args.port)
+    if not response or not response.get("ok"):
+        return None
+    return response["result"]
+
+
+def _print_profile(profile):
+    """Report the design system timing breakdown on stderr"""
+    source = "design cache hit" if profile.get("cached") else "generated"
+    print(f"Profile ({source}): total {profile['total_ms']:.2f} ms", file=sys.stderr)
+    for step, ms in profile.get("steps", []):
+        print(f"  {step:<28} {ms:>8.2f} ms", file=sys.stderr)
+    for domain, ms in profile.get("domains", []):
+        print(f"    {domain:<26} {ms:>8.2f} ms", file=sys.stderr)
+
+
+def _print_result(result, args):
+    """Print a search result as JSON or markdown, shaped to --budget when given"""
+    if args.budget:
+        result = shape_result(result, args.budget)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_output(result))
+
+
+def _print_cache_stats(args, use_daemon=True):
+    """Report result cache counters on stderr"""
+    from core import cache_stats
+    stats = (_via_daemon(args, {"op": "cache_stats"}) if use_daemon else None) or cache_stats()
+    print(f"Result cache: {json.dumps(stats)}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
+    parser.add_argument("--max-domains", type=int, default=MAX_DOMAINS, help=f"Domains returned when --domain is omitted (default: {MAX_DOMAINS})")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--budget", type=parse_budget, default=None,
+                        help="Fill results by rank and field priority up to N bytes of output (or N tokens: '500t')")
+    parser.add_argument("--backend", choices=BACKENDS, default="python", help="Scoring backend (numpy needs NumPy; identical rankings)")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
+    parser.add_argument("--format", "-f", choices=["ascii", "markdown", "json", "msgpack"], default="ascii",
+                        help="Output format for design system (json/msgpack: the structured result, see --schema)")
+    parser.add_argument("--schema", action="store_true", help="Print the JSON Schema of --format json design systems and exit")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--parallel", action="store_true", help="Run the design system's domain searches concurrently")
+    parser.add_argument("--profile", action="store_true", help="Print a per-step and per-domain timing breakdown of the design system to stderr (runs in-process)")
+    parser.add_argument("--manifest", type=str, default=None, help="Generate and persist design systems for every project/page in a JSON or YAML manifest")
+    parser.add_argument("--batch", type=str, default=None, help="Run every query in a JSON-lines file and stream JSON-lines results")
+    # Search daemon
+    parser.add_argument("--serve", action="store_true", help="Run a search daemon that keeps all indexes in memory")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help=f"Daemon port on localhost (default: {DAEMON_PORT})")
+    parser.add_argument("--no-daemon", action="store_true", help="Always search in-process, even if a daemon is running")
+    # Result cache
+    parser.add_argument("--disk-cache", action="store_true", help="Persist the result cache under .agent/.cache/")
+    parser.add_argument("--cache-stats", action="store_true", help="Print result cache hit/miss counters to stderr")
 
     args = parser.parse_args()
 
+    args.disk_cache = args.disk_cache or os.environ.get("UI_PRO_MAX_DISK_CACHE") == "1"
+    if args.disk_cache:
+        from core import RESULT_CACHE
+        RESULT_CACHE.enable_disk()
+
+    if args.serve:
+        import server
+        server.serve(port=args.port)
+        raise SystemExit(0)
+    if args.schema:
+        from design_system import DESIGN_SYSTEM_SCHEMA
+        print(json.dumps(DESIGN_SYSTEM_SCHEMA, indent=2))
+        raise SystemExit(0)
+    if args.format == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            parser.error("--format msgpack needs the msgpack package (pip install msgpack); use --format json")
+    if args.manifest:
+        from design_system import DESIGN_CACHE, DESIGN_DISK_CACHE_FILE, generate_from_manifest, load_manifest
+        if args.disk_cache:
+            DESIGN_CACHE.enable_disk(DESIGN_DISK_CACHE_FILE)
+        try:
+            summary = generate_from_manifest(load_manifest(args.manifest), args.output_dir)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"--manifest: {e}")
+        if args.json:
+            print(json.dumps(summary, indent=2, ensure_ascii=False))
+        else:
+            for project in summary["projects"]:
+                print(f"✅ {project['project']}: {len(project['created_files'])} files in {project['design_system_dir']}/")
+            print(f"{summary['files']} files for {len(summary['projects'])} projects "
+                  f"({summary['written']} written, {summary['files'] - summary['written']} unchanged)")
+        raise SystemExit(0)
+    if args.batch:
+        run_batch(args.batch, args.backend)
+        if args.cache_stats:
+            _print_cache_stats(args, use_daemon=False)
+        raise SystemExit(0)
+    if args.query is None:
+        parser.error("the following arguments are required: query")
+
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+        profile = {} if args.profile else None
+        # msgpack is packed here from the JSON result; machine formats keep stdout clean
+        output_format = "json" if args.format == "msgpack" else args.format
+        notes = sys.stderr if output_format == "json" else sys.stdout
+        # --profile and --parallel shape the in-process run, and the daemon never
+        # writes files, so all three bypass it
+        result = None if args.profile or args.parallel or args.persist else _via_daemon(args, {
+            "op": "design_system",
+            "query": args.query,
+            "project_name": args.project_name,
+            "output_format": output_format
+        })
+        if result is None:
+            import design_system
+            from design_system import DESIGN_CACHE, DESIGN_DISK_CACHE_FILE, generate_design_system
+            design_system.PARALLEL_SEARCH = design_system.PARALLEL_SEARCH or args.parallel
+            if args.disk_cache:
+                DESIGN_CACHE.enable_disk(DESIGN_DISK_CACHE_FILE)
+            result = generate_design_system(
+                args.query, 
+                args.project_name, 
+                output_format,
+                persist=args.persist,
+                page=args.page,
+                output_dir=args.output_dir,
+                profile=profile,
+                stream=None if args.format == "msgpack" else sys.stdout
+            )
+        if args.format == "msgpack":
+            sys.stdout.buffer.write(msgpack.packb(json.loads(result), use_bin_type=True))
+            sys.stdout.flush()
+        elif result:
+            print(result)
+        if profile:
+            _print_profile(profile)
         
         # Print persistence confirmation
         if args.persist:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
+            print("\n" + "=" * 60, file=notes)
+            print(f"✅ Design system persisted to design-system/{project_slug}/", file=notes)
+            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)", file=notes)
             if args.page:
                 page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
+                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)", file=notes)
+            print("", file=notes)
+            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.", file=notes)
+            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.", file=notes)
+            print("=" * 60, file=notes)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+        result = _via_daemon(args, {"op": "search_stack", "query": args.query, "stack": args.stack, "max_results": args.max_results, "backend": args.backend})
+        if result is None:
+            from core import search_stack
+            result = search_stack(args.query, args.stack, args.max_results, args.backend)
+        _print_result(result, args)
     # Domain search
+    elif args.domain:
+        result = _via_daemon(args, {"op": "search", "query": args.query, "domain": args.domain, "max_results": args.max_results, "backend": args.backend})
+        if result is None:
+            from core import search
+            result = search(args.query, args.domain, args.max_results, args.backend)
+        _print_result(result, args)
+    # Cross-domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+        result = _via_daemon(args, {"op": "search_all", "query": args.query, "max_results": args.max_results, "max_domains": args.max_domains})
+        if result is None:
+            from core import search_all
+            result = search_all(args.query, args.max_results, args.max_domains)
+        _print_result(result, args)
+
+    if args.cache_stats:
+        _print_cache_stats(args)
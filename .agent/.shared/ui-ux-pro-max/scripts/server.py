@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - keeps every domain and stack index hot in memory
+and answers search requests over a localhost TCP socket.
+
+Protocol: one JSON object per line in each direction. Every connection opens
+with a challenge in each direction, keyed on the secret token the daemon
+writes to DAEMON_TOKEN_DIR/daemon-<port>.token (mode 0600) when it starts:
+    -> {"op": "hello", "nonce": "<client nonce>"}
+    <- {"ok": true, "result": {"proof": "<hmac(token, daemon:client nonce)>", "nonce": "<daemon nonce>"}}
+The client only goes on when the proof matches, so the token never reaches
+(and no reply is trusted from) whatever else may listen on the port. Every
+request then carries "auth": hmac(token, client:daemon nonce).
+    -> {"op": "search", "query": "...", "domain": "style", "max_results": 3, "backend": "python"}
+    -> {"op": "search_stack", "query": "...", "stack": "react", "max_results": 3, "backend": "python"}
+    -> {"op": "search_all", "query": "...", "max_results": 3, "max_domains": 3}
+    -> {"op": "design_system", "query": "...", "project_name": null, "output_format": "ascii"}
+    -> {"op": "cache_stats"} | {"op": "ping"} | {"op": "shutdown"}
+    <- {"ok": true, "result": ...} | {"ok": false, "error": "..."}
+
+A line that is not a JSON object, a connection that does not open with
+hello, or a request with a wrong auth gets one error reply and the
+connection is closed. Token files that are not owned by the user or are
+readable by others are ignored. The daemon never writes files besides its
+token: persisted design systems are always generated in-process.
+
+Usage:
+    python search.py --serve [--port 47863]
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import stat
+import threading
+
+from config import DAEMON_PORT, DAEMON_TOKEN_DIR, MAX_DOMAINS, MAX_RESULTS
+
+# ============ CONFIGURATION ============
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = DAEMON_PORT
+CONNECT_TIMEOUT = 0.05   # seconds; a missing daemon must not slow the CLI down
+REQUEST_TIMEOUT = 30.0
+
+
+# ============ AUTH TOKEN ============
+def token_path(port: int = DEFAULT_PORT):
+    """Token file of the daemon on port: each daemon has its own."""
+    return DAEMON_TOKEN_DIR / f"daemon-{port}.token"
+
+
+def write_token(path) -> str:
+    """Create a fresh random token file readable only by the current user."""
+    token = secrets.token_hex(32)
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    try:
+        path.unlink()  # left by a daemon that died; never write through an existing file
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def read_token(path):
+    """The token in path, or None when missing or readable by anyone but its owner (the current user)."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    with os.fdopen(fd, "r", encoding="utf-8") as f:
+        info = os.fstat(f.fileno())
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o077):
+            return None
+        return f.read().strip() or None
+
+
+def remove_token(path, token: str):
+    """Delete path if it still holds token (a newer daemon may have replaced it)."""
+    if read_token(path) == token:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _proof(token: str, role: str, nonce) -> str:
+    return hmac.new(token.encode("utf-8"), f"{role}:{nonce}".encode("utf-8"), "sha256").hexdigest()
+
+
+# ============ SERVER ============
+def warm_indexes():
+    """Load every domain and stack index so the first request is already hot."""
+    from core import ALL_TARGETS, _warm_target, load_unified_index
+    for target in ALL_TARGETS:
+        _warm_target(target)
+    load_unified_index()
+
+
+def handle_request(request: dict):
+    """Dispatch one decoded request to the in-process search API."""
+    # The engine is only needed on the server side; clients import this module for request()
+    from core import cache_stats, search, search_all, search_stack
+    op = request.get("op", "search")
+    max_results = int(request.get("max_results") or MAX_RESULTS)
+    backend = request.get("backend", "python")
+
+    if op == "ping":
+        return "pong"
+    if op == "cache_stats":
+        return cache_stats()
+    if op == "search":
+        return search(request["query"], request.get("domain"), max_results, backend)
+    if op == "search_stack":
+        return search_stack(request["query"], request["stack"], max_results, backend)
+    if op == "search_all":
+        return search_all(request["query"], max_results, int(request.get("max_domains") or MAX_DOMAINS))
+    if op == "design_system":
+        from design_system import generate_design_system
+        return generate_design_system(
+            request["query"],
+            request.get("project_name"),
+            request.get("output_format", "ascii")
+        )
+    raise ValueError(f"Unknown op: {op}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        nonce = None
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            try:
+                request = json.loads(raw)
+            except ValueError:
+                request = None
+            if not isinstance(request, dict):
+                # Not our protocol (e.g. an HTTP request from a browser): stop reading
+                self._reply({"ok": False, "error": "invalid request"})
+                return
+            if nonce is None:
+                if request.get("op") != "hello":
+                    self._reply({"ok": False, "error": "expected hello"})
+                    return
+                nonce = secrets.token_hex(16)
+                self._reply({"ok": True, "result": {"proof": _proof(self.server.token, "daemon", request.get("nonce")),
+                                                    "nonce": nonce}})
+                continue
+            if not hmac.compare_digest(str(request.get("auth", "")), _proof(self.server.token, "client", nonce)):
+                self._reply({"ok": False, "error": "invalid auth"})
+                return
+            try:
+                if request.get("op") == "shutdown":
+                    self._reply({"ok": True, "result": "bye"})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                response = {"ok": True, "result": handle_request(request)}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self._reply(response)
+
+    def _reply(self, response: dict):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class SearchServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    token = ""
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Run the search daemon until interrupted or sent a shutdown request."""
+    warm_indexes()
+    with SearchServer((host, port), _RequestHandler) as server:
+        path = token_path(server.server_address[1])
+        server.token = write_token(path)
+        print(f"UI Pro Max search daemon listening on {host}:{server.server_address[1]}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            remove_token(path, server.token)
+
+
+# ============ CLIENT ============
+def _exchange(f, sock, message: dict):
+    """Send one request line and read the reply dict (None if it is not one)."""
+    sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    line = f.readline()
+    try:
+        response = json.loads(line) if line else None
+    except ValueError:
+        return None
+    return response if isinstance(response, dict) else None
+
+
+def request(payload: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """
+    Send one request to a running daemon.
+
+    Returns the decoded response dict, or None when no daemon is listening (or
+    no token is available, or the listener cannot prove it holds the token)
+    so callers can fall back to in-process search.
+    """
+    token = read_token(token_path(port))
+    if token is None:
+        return None
+    try:
+        sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+    except OSError:
+        return None
+
+    nonce = secrets.token_hex(16)
+    with sock:
+        sock.settimeout(REQUEST_TIMEOUT)
+        try:
+            with sock.makefile("rb") as f:
+                hello = _exchange(f, sock, {"op": "hello", "nonce": nonce})
+                challenge = hello.get("result") if hello and hello.get("ok") else None
+                if not isinstance(challenge, dict) or not hmac.compare_digest(
+                        str(challenge.get("proof", "")), _proof(token, "daemon", nonce)):
+                    return None
+                return _exchange(f, sock, {**payload, "auth": _proof(token, "client", challenge.get("nonce"))})
+        except OSError:
+            return None
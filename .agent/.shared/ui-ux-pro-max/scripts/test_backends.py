@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parity check: the numpy backend must rank exactly like the python backend
+on every bundled domain and stack CSV.
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import core
+
+try:
+    import numpy  # noqa: F401
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+QUERIES = [
+    "glassmorphism dark mode",
+    "saas dashboard analytics",
+    "accessibility contrast focus",
+    "animation hover transition",
+    "responsive layout grid mobile",
+    "form validation error",
+    "elegant luxury serif",
+    "state performance list",
+    "zzqx nonexistentterm",
+]
+RANDOM_QUERIES = 40   # extra queries per target drawn from its own vocabulary
+TOP_K = (None, 1, 3, 10)
+
+
+@unittest.skipUnless(HAS_NUMPY, "the numpy backend needs NumPy")
+class BackendParityTest(unittest.TestCase):
+    def _check_target(self, target):
+        filepath, search_cols, output_cols, tokenizer = core._target_config(target)
+        index = core.load_index(filepath, search_cols, output_cols, tokenizer)
+        rng = random.Random(target)
+        vocab = sorted(index.bm25.postings)
+        queries = QUERIES + [" ".join(rng.sample(vocab, rng.randint(1, min(5, len(vocab)))))
+                             for _ in range(RANDOM_QUERIES)]
+        for query in queries:
+            for top_k in TOP_K:
+                with self.subTest(target=target, query=query, top_k=top_k):
+                    self.assertEqual(index.score(query, top_k, "python"), index.score(query, top_k, "numpy"))
+
+    def test_domains(self):
+        for domain in core.CSV_CONFIG:
+            self._check_target(domain)
+
+    def test_stacks(self):
+        for stack in core.STACK_CONFIG:
+            self._check_target(f"stack:{stack}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search engine checks for core.py.
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import core
+from cache import ResultCache
+
+
+class FuzzyExpansionTest(unittest.TestCase):
+    def test_known_terms_rank_exactly(self):
+        # A query with any vocabulary term must not pick up look-alikes of its other words
+        rng = random.Random(11)
+        for domain in core.CSV_CONFIG:
+            index = core.load_index(*core._target_config(domain))
+            vocab = sorted(index.bm25.postings)
+            queries = ["saas general", "fintech dashbord", "glassmorphism darkk mode"]
+            queries += [f"{rng.choice(vocab)} {rng.choice(vocab)[:-1]}x" for _ in range(30)]
+            for query in queries:
+                if not index.bm25.query_terms(query, fuzzy=False):
+                    continue  # nothing known in this domain: expansion is the fallback
+                with self.subTest(domain=domain, query=query):
+                    self.assertEqual(index.score(query, fuzzy=True), index.score(query, fuzzy=False))
+
+    def test_unknown_terms_expand(self):
+        index = core.load_index(*core._target_config("style"))
+        self.assertEqual(index.score("glasmorphsm", fuzzy=False), [])
+        self.assertTrue(index.score("glasmorphsm", fuzzy=True))
+        self.assertTrue(core.search_all("dashbord", fuzzy=True)["count"])
+        self.assertEqual(core.search_all("dashbord", fuzzy=False)["count"], 0)
+
+    def test_search_all_known_terms(self):
+        for query in ("saas general", "fintech dashbord", "react memo rerendr"):
+            with self.subTest(query=query):
+                self.assertEqual(core.search_all(query, fuzzy=True), core.search_all(query, fuzzy=False))
+
+
+class IndexRelocationTest(unittest.TestCase):
+    """A persisted index must read rows from the CSV it was loaded for, not the one it was built from."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.index_dir = self.tmp / "index"
+        self.addCleanup(core._INDEX_CACHE.clear)
+        _, self.search_cols, self.output_cols, self.tokenizer = core._target_config("style")
+        self.file = core.CSV_CONFIG["style"]["file"]
+        (self.tmp / "a").mkdir()
+        shutil.copy2(core.DATA_DIR / self.file, self.tmp / "a" / self.file)
+
+    def load(self, data_dir):
+        core._INDEX_CACHE.clear()
+        with mock.patch.object(core, "DATA_DIR", data_dir), mock.patch.object(core, "INDEX_DIR", self.index_dir):
+            index = core.load_index(data_dir / self.file, self.search_cols, self.output_cols, self.tokenizer)
+        self.assertEqual(index.rows.filepath, data_dir / self.file)
+        return index
+
+    def assert_rows(self, index, expected):
+        ranked = index.score("glassmorphism dark", top_k=5)
+        self.assertTrue(ranked)
+        self.assertEqual(index.rows_for([i for i, _ in ranked]), expected)
+
+    def test_moved_and_copied_tree(self):
+        index = self.load(self.tmp / "a")
+        expected = index.rows_for([i for i, _ in index.score("glassmorphism dark", top_k=5)])
+
+        # Moved with its mtime: the stored stamp still matches
+        (self.tmp / "a").rename(self.tmp / "b")
+        self.assert_rows(self.load(self.tmp / "b"), expected)
+
+        # Touched after the move: reused through the content hash
+        os.utime(self.tmp / "b" / self.file, ns=(0, 0))
+        self.assert_rows(self.load(self.tmp / "b"), expected)
+
+        # Copied, then the original removed
+        shutil.copytree(self.tmp / "b", self.tmp / "c")
+        shutil.rmtree(self.tmp / "b")
+        self.assert_rows(self.load(self.tmp / "c"), expected)
+        self.assertEqual(len(list(self.index_dir.rglob("*.idx"))), 1)
+
+
+class SearchManyTest(unittest.TestCase):
+    def test_max_results_zero_is_kept(self):
+        queries = [("glassmorphism dark", "style", 0), ("glassmorphism dark", "style", None), ("glassmorphism dark", "style")]
+        self.assertEqual([r["count"] for r in core.search_many(queries)],
+                         [0, core.MAX_RESULTS, core.MAX_RESULTS])
+        self.assertEqual(next(core.search_many(queries[:1])), core.search(*queries[0]))
+
+
+class TokenizerCacheTest(unittest.TestCase):
+    def test_fit_leaves_query_cache_alone(self):
+        tokenizer = core.Tokenizer(stem=True)
+        tokenizer("dark mode")
+        bm25 = core.BM25(tokenizer=tokenizer)
+        bm25.fit([f"document {i} about dark glassmorphism" for i in range(100)])
+        self.assertEqual(tokenizer._tokenize_cached.cache_info().currsize, 1)
+        self.assertEqual(bm25.N, 100)
+        self.assertEqual(bm25.tokenize("dark mode"), tokenizer._tokenize("dark mode"))
+        self.assertEqual(tokenizer._tokenize_cached.cache_info().hits, 1)
+
+
+class ResultCacheSaveTest(unittest.TestCase):
+    def test_concurrent_saves(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        caches = []
+        for n in range(4):
+            cache = ResultCache()
+            cache.disk_path = tmp / "results.json"
+            cache.put(f"key {n}", {"n": n})
+            caches.append(cache)
+
+        # Every save has written its temp file before any of them is renamed
+        barrier = threading.Barrier(len(caches), timeout=5)
+        replace = os.replace
+        sources = []
+
+        def replace_together(src, dst):
+            sources.append(src)
+            barrier.wait()
+            replace(src, dst)
+
+        threads = [threading.Thread(target=cache.save) for cache in caches]
+        with mock.patch.object(os, "replace", replace_together):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(set(sources)), len(caches))
+        self.assertFalse(any(cache._dirty for cache in caches))
+        self.assertEqual([p.name for p in tmp.iterdir()], ["results.json"])
+        loaded = ResultCache()
+        loaded.enable_disk(tmp / "results.json")
+        self.assertEqual(len(loaded.entries), 1)
+
+if __name__ == "__main__":
+    unittest.main()
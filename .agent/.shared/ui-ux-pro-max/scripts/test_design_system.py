@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot check: the design system and page overrides generated for every
+bundled product type must stay exactly as recorded in
+testdata/design_systems.json (sha256 of the sorted JSON of each).
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+       python test_design_system.py --update   # re-record after an intended change
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from design_system import DATA_DIR, DesignSystemGenerator, _generate_intelligent_overrides
+
+SNAPSHOT = Path(__file__).resolve().parent / "testdata" / "design_systems.json"
+PAGES = ["Dashboard", "Checkout", "Settings", "Landing", "Pricing"]
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def snapshot() -> dict:
+    """Product type -> digests of its design system and of its page overrides."""
+    with open(DATA_DIR / "products.csv", "r", encoding="utf-8") as f:
+        products = [row["Product Type"] for row in csv.DictReader(f)]
+    digests = {}
+    for product in products:
+        system = DesignSystemGenerator().generate(product)
+        overrides = {page: _generate_intelligent_overrides(page, product, system) for page in PAGES}
+        digests[product] = {"design_system": _digest(system), "overrides": _digest(overrides)}
+    return digests
+
+
+class DesignSystemSnapshotTest(unittest.TestCase):
+    def test_bundled_outputs_unchanged(self):
+        expected = json.loads(SNAPSHOT.read_text(encoding="utf-8"))
+        actual = snapshot()
+        self.assertEqual(sorted(actual), sorted(expected))
+        changed = [f"{product} ({part})" for product in expected for part in ("design_system", "overrides")
+                   if actual[product][part] != expected[product][part]]
+        self.assertFalse(changed, f"{len(changed)} outputs changed: {', '.join(changed)}")
+
+
+if __name__ == "__main__":
+    if "--update" in sys.argv:
+        SNAPSHOT.write_text(json.dumps(snapshot(), indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+    else:
+        unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ReasoningIndex must pick the same rule as the original linear scan over the
+reasoning CSV (exact, then partial, then keyword match; first rule wins).
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import csv
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from design_system import DATA_DIR, ReasoningIndex, load_reasoning_index
+
+NO_MATCH = ["zzqx", "12345", "Ω", "qq", "xyzzy plugh"]
+
+
+def linear_scan(rules: list, category: str) -> dict:
+    """The lookup ReasoningIndex replaced, kept verbatim as the reference."""
+    category_lower = category.lower()
+
+    # Try exact match first
+    for rule in rules:
+        if rule.get("UI_Category", "").lower() == category_lower:
+            return rule
+
+    # Try partial match
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        if ui_cat in category_lower or category_lower in ui_cat:
+            return rule
+
+    # Try keyword match
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        keywords = ui_cat.replace("/", " ").replace("-", " ").split()
+        if any(kw in category_lower for kw in keywords):
+            return rule
+
+    return {}
+
+
+def sample_inputs(categories: list, seed: int = 1, count: int = 2000) -> list:
+    """Categories, their words, case variants, random substrings and word pairs."""
+    words = sorted({w for c in categories for w in c.replace("/", " ").replace("-", " ").split()})
+    inputs = set(categories) | set(words) | {c.upper() for c in categories} | set(NO_MATCH) | {"", " ", "/", "-"}
+    rng = random.Random(seed)
+    for _ in range(count):
+        source = rng.choice(categories)
+        i = rng.randrange(len(source) + 1)
+        inputs.add(source[i:rng.randrange(i, len(source) + 1)])
+        if len(words) >= 2:
+            inputs.add(" ".join(rng.sample(words, 2)))
+        inputs.add(rng.choice(words)[:rng.randint(1, 6)] if words else "")
+    return sorted(inputs)
+
+
+class ReasoningIndexTest(unittest.TestCase):
+    def assert_same_rule(self, rules: list, inputs: list):
+        index = ReasoningIndex(rules)
+        for category in inputs:
+            with self.subTest(category=category):
+                # Compare positions: equal-looking rules must still be the first one
+                expected = linear_scan(rules, category)
+                position = next((i for i, rule in enumerate(rules) if rule is expected), -1)
+                self.assertEqual(index.find(category), position)
+                self.assertEqual(index.rule(category), expected)
+
+    def test_bundled_csv(self):
+        rules = load_reasoning_index().rules
+        self.assertTrue(rules, "reasoning CSV is empty")
+        with open(DATA_DIR / "products.csv", "r", encoding="utf-8") as f:
+            products = [row["Product Type"] for row in csv.DictReader(f)]
+        categories = [rule["UI_Category"] for rule in rules]
+        self.assert_same_rule(rules, sample_inputs(categories + products))
+
+    def test_first_match_order(self):
+        # Duplicates, nested names and short keywords: the earliest rule must win
+        categories = ["SaaS Dashboard", "SaaS", "AI/ML Tool", "saas", "E-commerce Luxury", "E-commerce", "Go", ""]
+        rules = [{"UI_Category": category, "Severity": str(i)} for i, category in enumerate(categories)]
+        self.assert_same_rule(rules, sample_inputs([c for c in categories if c]) + ["saas (general)", "b2b go"])
+
+    def test_no_match(self):
+        rules = [{"UI_Category": "Fintech/Crypto"}, {"UI_Category": "Healthcare App"}]
+        for category in NO_MATCH:
+            with self.subTest(category=category):
+                self.assertEqual(ReasoningIndex(rules).rule(category), {})
+                self.assertEqual(linear_scan(rules, category), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
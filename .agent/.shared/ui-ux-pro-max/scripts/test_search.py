@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+--budget output shaping in search.py: the printed text, header and budget
+line included, never exceeds the limit and used_bytes reports its size.
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import argparse
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import search, search_all, search_stack
+from search import MIN_BUDGET_BYTES, format_output, parse_budget, shape_result
+
+QUERIES = ["glassmorphism dark mode", "form validation error accessibility keyboard", "a",
+           "elegant luxury serif typography heading font pairing for premium brands " * 6]
+BUDGETS = list(range(MIN_BUDGET_BYTES, 600, 7)) + list(range(600, 6000, 211))
+
+
+class BudgetTest(unittest.TestCase):
+    def test_used_bytes_within_limit(self):
+        for query in QUERIES:
+            results = {"search": search(query, "style"), "typography": search(query, "typography", 10),
+                       "search_all": search_all(query), "search_stack": search_stack(query, "react")}
+            for kind, result in results.items():
+                for budget in BUDGETS:
+                    with self.subTest(query=query[:30], kind=kind, budget=budget):
+                        shaped = shape_result(result, budget)
+                        printed = len((format_output(shaped) + "\n").encode("utf-8"))
+                        self.assertLessEqual(shaped["budget"]["used_bytes"], shaped["budget"]["limit_bytes"])
+                        self.assertEqual(shaped["budget"]["used_bytes"], printed)
+
+    def test_large_budget_keeps_everything(self):
+        result = search_all("glassmorphism dark mode")
+        shaped = shape_result(result, 1_000_000)
+        self.assertEqual(shaped["budget"]["omitted_fields"] + shaped["budget"]["truncated_fields"], 0)
+        self.assertEqual(shaped["domains"], result["domains"])
+
+    def test_parse_budget(self):
+        self.assertEqual(parse_budget("400t"), 1600)
+        self.assertEqual(parse_budget(f"{MIN_BUDGET_BYTES}b"), MIN_BUDGET_BYTES)
+        for text in ("200", "0", "-5", "lots"):
+            with self.subTest(text=text), self.assertRaises(argparse.ArgumentTypeError):
+                parse_budget(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
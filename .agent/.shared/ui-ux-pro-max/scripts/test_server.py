@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Daemon handshake in server.py: per-port token files, the owner-only mode
+check, and a client that never sends its token to (or trusts a reply from)
+a listener that cannot prove it holds the token.
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import server
+from core import search
+
+
+class DaemonTestCase(unittest.TestCase):
+    def setUp(self):
+        self.token_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.token_dir)
+        patcher = mock.patch.object(server, "DAEMON_TOKEN_DIR", self.token_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start_daemon(self):
+        daemon = server.SearchServer((server.DEFAULT_HOST, 0), server._RequestHandler)
+        port = daemon.server_address[1]
+        daemon.token = server.write_token(server.token_path(port))
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            daemon.shutdown()
+            daemon.server_close()
+            thread.join()
+        self.addCleanup(stop)
+        return port
+
+    def raw_lines(self, port, messages):
+        """Send messages on one connection and return the decoded replies."""
+        with socket.create_connection((server.DEFAULT_HOST, port), timeout=5) as sock, sock.makefile("rb") as f:
+            replies = []
+            for message in messages:
+                sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+                line = f.readline()
+                if not line:
+                    break
+                replies.append(json.loads(line))
+            return replies
+
+
+class HandshakeTest(DaemonTestCase):
+    def test_round_trip(self):
+        port = self.start_daemon()
+        self.assertEqual(server.request({"op": "ping"}, port=port), {"ok": True, "result": "pong"})
+        response = server.request({"op": "search", "query": "glassmorphism dark", "domain": "style"}, port=port)
+        self.assertEqual(response["result"], search("glassmorphism dark", "style"))
+
+    def test_tokens_per_port(self):
+        first, second = self.start_daemon(), self.start_daemon()
+        self.assertNotEqual(server.read_token(server.token_path(first)), server.read_token(server.token_path(second)))
+        for port in (first, second):
+            self.assertEqual(server.request({"op": "ping"}, port=port)["result"], "pong")
+
+    def test_daemon_rejects_unauthenticated_requests(self):
+        port = self.start_daemon()
+        token = server.read_token(server.token_path(port))
+        replies = self.raw_lines(port, [{"op": "ping", "token": token}, {"op": "ping"}])
+        self.assertEqual(replies, [{"ok": False, "error": "expected hello"}])
+        replies = self.raw_lines(port, [{"op": "hello", "nonce": "n"}, {"op": "ping", "auth": "0" * 64}])
+        self.assertEqual(replies[1], {"ok": False, "error": "invalid auth"})
+
+    def test_token_file_mode(self):
+        path = server.token_path(1234)
+        token = server.write_token(path)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o600)
+        self.assertEqual(server.read_token(path), token)
+        if hasattr(os, "getuid"):
+            path.chmod(0o644)
+            self.assertIsNone(server.read_token(path))
+        server.remove_token(path, "another daemon's token")
+        self.assertTrue(path.exists())
+        path.chmod(0o600)
+        server.remove_token(path, token)
+        self.assertFalse(path.exists())
+
+
+class ImpostorTest(DaemonTestCase):
+    """Something else listens on the port the token file names."""
+
+    def test_token_not_sent_to_impostor(self):
+        listener = socket.create_server((server.DEFAULT_HOST, 0))
+        self.addCleanup(listener.close)
+        port = listener.getsockname()[1]
+        token = server.write_token(server.token_path(port))
+        received = []
+
+        def impostor():
+            conn, _ = listener.accept()
+            with conn, conn.makefile("rb") as f:
+                for line in f:
+                    received.append(line)
+                    conn.sendall(json.dumps({"ok": True, "result": {"proof": "0" * 64, "nonce": "n"}}).encode() + b"\n")
+
+        thread = threading.Thread(target=impostor, daemon=True)
+        thread.start()
+        self.assertIsNone(server.request({"op": "search", "query": "secret project"}, port=port))
+        thread.join(5)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(json.loads(received[0])["op"], "hello")
+        self.assertNotIn(token.encode(), b"".join(received))
+
+
+if __name__ == "__main__":
+    unittest.main()
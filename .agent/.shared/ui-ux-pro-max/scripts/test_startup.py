@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup budget: a default `search.py` domain search must import within
+benchmark.IMPORT_BUDGET_MS and must not load benchmark.IMPORT_FORBIDDEN
+(the same check as `benchmark.py --check-imports`).
+
+Usage: python -m unittest discover -s .agent/.shared/ui-ux-pro-max/scripts
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import benchmark
+
+
+class StartupImportTest(unittest.TestCase):
+    def test_default_search_within_budget(self):
+        report = benchmark.measure_imports()
+        self.assertEqual(report["forbidden_loaded"], [])
+        self.assertLessEqual(report["import_ms"], benchmark.IMPORT_BUDGET_MS, report)
+
+
+if __name__ == "__main__":
+    unittest.main()
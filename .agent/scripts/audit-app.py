@@ -6,18 +6,24 @@ Static security audit for Flutter apps (Dart + Android + iOS config).
 Usage:
   python flutter_security_audit.py /path/to/flutter/project --json out.json
   python flutter_security_audit.py . --severity high
+  python flutter_security_audit.py . --jobs 0   # one worker process per CPU
+  python flutter_security_audit.py . --cache    # rescan only files changed since the last --cache run
+  python flutter_security_audit.py . --changed-since origin/main --lines-only
+  python flutter_security_audit.py . --staged
 """
 
 from __future__ import annotations
 
 import argparse
 import fnmatch
+import hashlib
 import json
 import os
 import re
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 
 # -----------------------------
@@ -67,8 +73,23 @@ def is_excluded(path: Path) -> bool:
     return False
 
 def iter_files(root: Path) -> Iterable[Path]:
-    for p in root.rglob("*"):
-        if p.is_dir():
+    # Walk with os.scandir and never descend into an excluded directory: every
+    # path below one is excluded too. Files are still checked one by one, since
+    # nested entries like android/build also match by path prefix.
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        p = Path(entry.path)
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not is_excluded(p):
+                    yield from iter_files(p)
+                continue
+            if entry.is_dir():
+                continue  # symlinked directories are not followed
+        except OSError:
             continue
         if is_excluded(p):
             continue
@@ -224,6 +245,25 @@ IOS_RULES: List[Tuple[str, str, str, re.Pattern, str]] = [
     ),
 ]
 
+# Substrings every match of a rule contains (lowercase for IGNORECASE rules).
+# A file with none of them is not searched with that rule at all; keep these
+# in sync when a pattern above changes. Rules not listed are always searched.
+RULE_LITERALS = {
+    "DART_HTTP_URL": ("http://",),
+    "DART_BAD_CERT_CALLBACK": ("badCertificateCallback",),
+    "DART_PRINT_LOG": ("print", "debugPrint", "logger."),
+    "DART_WEBVIEW_JS": ("javascriptMode", "javaScriptEnabled"),
+    "SECRET_PRIVATE_KEY": ("-----BEGIN ",),
+    "SECRET_AWS_KEY": ("AKIA",),
+    "SECRET_GCP_KEY": ("AIza",),
+    "SECRET_JWT": ("eyJ",),
+    "SECRET_GENERIC": ("api", "token", "secret", "password", "passwd", "auth"),
+    "ANDROID_CLEARTEXT": ("android:usescleartexttraffic",),
+    "ANDROID_DEBUGGABLE": ("android:debuggable",),
+    "ANDROID_EXPORTED": ("android:exported",),
+    "IOS_ATS_ARBITRARY_LOADS": ("NSAllowsArbitraryLoads",),
+}
+
 HTTP_URL_PATTERN = re.compile(r"""http://[^\s'")>\]]+""", re.IGNORECASE)
 RANDOM_PATTERN = re.compile(r"""\bRandom\s*\(""")
 RANDOM_SECURITY_CONTEXT_PATTERN = re.compile(
@@ -242,20 +282,67 @@ URL_SCAN_IGNORED_PREFIXES = (
 )
 
 DEFAULT_IGNORE_REL_PATH = ".agent/audit-ignore.json"
+DEFAULT_CACHE_REL_PATH = ".agent/.cache/audit-app.json"
+
+# Project-wide settings every changed file depends on: always scanned (and
+# reported in full) by --changed-since / --staged.
+PROJECT_CONFIG_FILES = (
+    "pubspec.yaml",
+    "android/app/src/main/AndroidManifest.xml",
+    "ios/Runner/Info.plist",
+)
 
 
 # -----------------------------
 # Audit functions
 # -----------------------------
 
+def _candidate_rules(
+    patterns: List[Tuple[str, str, str, re.Pattern, str]],
+    content: str,
+) -> List[Tuple[str, str, str, re.Pattern, str]]:
+    """
+    Rules of a table that can match somewhere in a file, in table order.
+
+    Rules with RULE_LITERALS are kept when one of their literals occurs in the
+    file (a plain substring test); other rules when their pattern matches the
+    joined file text, which every per-line match also does.
+    """
+    lowered = None
+    candidates = []
+    for rule in patterns:
+        rule_id, pat = rule[0], rule[3]
+        literals = RULE_LITERALS.get(rule_id)
+        if literals is None:
+            if pat.search(content):
+                candidates.append(rule)
+            continue
+        if pat.flags & re.IGNORECASE or pat.pattern.startswith("(?i)"):
+            if lowered is None:
+                lowered = content.lower()
+            haystack = lowered
+        else:
+            haystack = content
+        if any(literal in haystack for literal in literals):
+            candidates.append(rule)
+    return candidates
+
 def scan_file_for_patterns(
     path: Path,
     lines: List[str],
     patterns: List[Tuple[str, str, str, re.Pattern, str]],
     findings: List[Finding],
+    content: Optional[str] = None,
 ):
+    # Most rules never match a given file: drop them with one pass over the
+    # whole text, then run the rest line by line so findings keep their order.
+    if content is None:
+        content = "\n".join(lines)
+    candidates = _candidate_rules(patterns, content)
+    if not candidates:
+        return
     for idx, line in enumerate(lines, start=1):
-        for rule_id, title, severity, pat, rec in patterns:
+        for rule_id, title, severity, pat, rec in candidates:
             if pat.search(line):
                 add_finding(findings, rule_id, title, severity, path, idx, line, rec)
 
@@ -337,24 +424,111 @@ def load_ignore_rules(root: Path, ignore_file: Optional[str]) -> List[dict]:
 
     return [rule for rule in rules if isinstance(rule, dict)]
 
+_GLOB_MAGIC = re.compile(r"""[*?\[]""")
+
+class IgnoreMatcher:
+    """
+    Ignore rules compiled once and grouped by rule_id.
+
+    Matches exactly like checking every rule with fnmatch: both sides go
+    through os.path.normcase, an empty path glob skips the path check, and
+    rule_id / severity / snippet_contains compare as strings. Rules with only
+    a path condition are merged per rule_id into one prefix tuple ("lib/*",
+    "**"), one set of exact paths and one combined regex for other globs;
+    rules with severity or snippet conditions are checked one by one.
+    """
+
+    def __init__(self, root: Path, ignore_rules: List[dict]):
+        self.root = root
+        self._rel_paths: Dict[str, str] = {}
+        grouped: Dict[str, dict] = {}
+        for rule in ignore_rules:
+            rule_id = str(rule.get("rule_id", "*"))
+            path_glob = str(rule.get("path", "**"))
+            snippet_contains = rule.get("snippet_contains")
+            severity = rule.get("severity")
+            group = grouped.setdefault(rule_id, {"prefixes": [], "exact": set(), "globs": [], "conditional": []})
+            if severity is None and snippet_contains is None:
+                self._add_path(group, path_glob)
+            else:
+                group["conditional"].append((
+                    None if severity is None else str(severity),
+                    self._compile_path(path_glob),
+                    None if snippet_contains is None else str(snippet_contains),
+                ))
+        self.groups = {
+            rule_id: (
+                tuple(group["prefixes"]),
+                frozenset(group["exact"]),
+                re.compile("|".join(f"(?:{fnmatch.translate(glob)})" for glob in group["globs"])).match
+                if group["globs"] else None,
+                group["conditional"],
+            )
+            for rule_id, group in grouped.items()
+        }
+
+    @staticmethod
+    def _add_path(group: dict, path_glob: str):
+        if not path_glob:
+            group["prefixes"].append("")
+            return
+        glob = os.path.normcase(path_glob)
+        literal = glob.rstrip("*")
+        if _GLOB_MAGIC.search(literal):
+            group["globs"].append(glob)
+        elif literal != glob:
+            group["prefixes"].append(literal)
+        else:
+            group["exact"].add(glob)
+
+    @staticmethod
+    def _compile_path(path_glob: str):
+        """Callable(normcased path) -> bool for one rule's path condition."""
+        if not path_glob:
+            return lambda path: True
+        glob = os.path.normcase(path_glob)
+        literal = glob.rstrip("*")
+        if _GLOB_MAGIC.search(literal):
+            match = re.compile(fnmatch.translate(glob)).match
+            return lambda path: match(path) is not None
+        if literal != glob:
+            return lambda path: path.startswith(literal)
+        return lambda path: path == glob
+
+    def _rel_path(self, file: str) -> str:
+        rel = self._rel_paths.get(file)
+        if rel is None:
+            rel = self._rel_paths[file] = os.path.normcase(_to_rel_posix(Path(file), self.root))
+        return rel
+
+    def matches(self, finding: Finding) -> bool:
+        path = None
+        for rule_id in (finding.rule_id, "*"):
+            group = self.groups.get(rule_id)
+            if group is None:
+                continue
+            if path is None:
+                path = self._rel_path(finding.file)
+            prefixes, exact, glob_match, conditional = group
+            if path.startswith(prefixes) or path in exact or (glob_match is not None and glob_match(path)):
+                return True
+            for severity, path_matches, snippet_contains in conditional:
+                if severity is not None and severity != finding.severity:
+                    continue
+                if not path_matches(path):
+                    continue
+                if snippet_contains is not None and snippet_contains not in finding.snippet:
+                    continue
+                return True
+        return False
+
+@lru_cache(maxsize=16)
+def _ignore_matcher(root: Path, rules_key: str) -> IgnoreMatcher:
+    return IgnoreMatcher(root, json.loads(rules_key))
+
 def should_ignore_finding(finding: Finding, root: Path, ignore_rules: List[dict]) -> bool:
-    finding_path = _to_rel_posix(Path(finding.file), root)
-    for rule in ignore_rules:
-        rule_id = str(rule.get("rule_id", "*"))
-        path_glob = str(rule.get("path", "**"))
-        snippet_contains = rule.get("snippet_contains")
-        severity = rule.get("severity")
-
-        if rule_id != "*" and rule_id != finding.rule_id:
-            continue
-        if severity is not None and str(severity) != finding.severity:
-            continue
-        if path_glob and not fnmatch.fnmatch(finding_path, path_glob):
-            continue
-        if snippet_contains is not None and str(snippet_contains) not in finding.snippet:
-            continue
-        return True
-    return False
+    # Matchers are cached per ruleset by value, so a list edited between calls still gets a fresh one
+    return _ignore_matcher(root, json.dumps(ignore_rules, sort_keys=True, default=str)).matches(finding)
 
 def scan_manifest_exported_missing(path: Path, lines: List[str], findings: List[Finding]):
     """
@@ -415,41 +589,162 @@ def detect_pubspec_security_notes(root: Path, findings: List[Finding]):
                 "Review how this package is used. Ensure secrets are never stored in plaintext and networking is secure."
             )
 
-def audit(root: Path) -> List[Finding]:
+def scan_file(path: Path, root: Path) -> List[Finding]:
     findings: List[Finding] = []
+    lines = read_lines(path)
+    if not lines:
+        return findings
 
-    detect_pubspec_security_notes(root, findings)
+    p = str(path).replace("\\", "/")
+    rel_posix_path = path.relative_to(root).as_posix()
+    content = "\n".join(lines)
 
-    for path in iter_files(root):
-        lines = read_lines(path)
-        if not lines:
-            continue
+    # Dart + general secrets
+    if path.suffix.lower() == ".dart":
+        scan_file_for_patterns(path, lines, RULES_DART, findings, content)
+        scan_dart_random_security_context(path, lines, findings)
+        scan_file_for_patterns(path, lines, SECRET_PATTERNS, findings, content)
+
+    # General secrets in all text files (but avoid noisy md unless you want)
+    if path.suffix.lower() in {".yaml", ".yml", ".json", ".properties", ".gradle", ".kt", ".java", ".xml", ".plist"}:
+        scan_file_for_patterns(path, lines, SECRET_PATTERNS, findings, content)
+
+    # Android manifest checks
+    if p.endswith("android/app/src/main/AndroidManifest.xml") or p.endswith("AndroidManifest.xml"):
+        scan_file_for_patterns(path, lines, ANDROID_RULES, findings, content)
+        scan_manifest_exported_missing(path, lines, findings)
 
-        p = str(path).replace("\\", "/")
-        rel_posix_path = path.relative_to(root).as_posix()
+    # iOS plist checks
+    if p.endswith("ios/Runner/Info.plist") or p.endswith("Info.plist"):
+        scan_file_for_patterns(path, lines, IOS_RULES, findings, content)
 
-        # Dart + general secrets
-        if path.suffix.lower() == ".dart":
-            scan_file_for_patterns(path, lines, RULES_DART, findings)
-            scan_dart_random_security_context(path, lines, findings)
-            scan_file_for_patterns(path, lines, SECRET_PATTERNS, findings)
+    # Any file: insecure URLs
+    if path.suffix.lower() in TEXT_EXTS:
+        scan_http_urls(path, rel_posix_path, lines, findings)
 
-        # General secrets in all text files (but avoid noisy md unless you want)
-        if path.suffix.lower() in {".yaml", ".yml", ".json", ".properties", ".gradle", ".kt", ".java", ".xml", ".plist"}:
-            scan_file_for_patterns(path, lines, SECRET_PATTERNS, findings)
+    return findings
 
-        # Android manifest checks
-        if p.endswith("android/app/src/main/AndroidManifest.xml") or p.endswith("AndroidManifest.xml"):
-            scan_file_for_patterns(path, lines, ANDROID_RULES, findings)
-            scan_manifest_exported_missing(path, lines, findings)
+def _scan_files(paths: List[Path], root: Path, jobs: int) -> Iterable[List[Finding]]:
+    """Per-file findings in the order of paths, scanned by up to `jobs` processes."""
+    if jobs <= 1 or len(paths) < 2:
+        return (scan_file(path, root) for path in paths)
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
 
-        # iOS plist checks
-        if p.endswith("ios/Runner/Info.plist") or p.endswith("Info.plist"):
-            scan_file_for_patterns(path, lines, IOS_RULES, findings)
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map() yields in submission order, so the merged report matches a serial run
+        return list(pool.map(partial(scan_file, root=root), paths, chunksize=chunksize))
 
-        # Any file: insecure URLs
-        if path.suffix.lower() in TEXT_EXTS:
-            scan_http_urls(path, rel_posix_path, lines, findings)
+def ruleset_version() -> str:
+    """Hash of this script: any change to a rule, literal or scan helper invalidates the cache."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:16]
+
+class AuditCache:
+    """
+    Per-file findings keyed on (relative path, content hash), stored as JSON.
+
+    Entries are only reused under the rule-set version they were produced by,
+    and only files seen in the current run are written back. Ignore rules are
+    not part of the cache; they are applied to the merged findings as usual.
+    """
+
+    def __init__(self, root: Path, path: Path):
+        self.root = root
+        self.path = path
+        self.version = ruleset_version()
+        self.entries: dict = {}
+        self.seen: dict = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            data = {}
+        if isinstance(data, dict) and data.get("version") == self.version:
+            self.entries = data.get("files", {})
+
+    def _digest(self, path: Path) -> str:
+        try:
+            return hashlib.sha1(path.read_bytes()).hexdigest()
+        except OSError:
+            return ""
+
+    def get(self, path: Path) -> Optional[List[Finding]]:
+        rel = path.relative_to(self.root).as_posix()
+        digest = self._digest(path)
+        self.seen[rel] = {"sha1": digest, "findings": None}
+        entry = self.entries.get(rel)
+        if not entry or entry.get("sha1") != digest:
+            return None
+        self.seen[rel]["findings"] = entry["findings"]
+        return [Finding(file=str(path), **stored) for stored in entry["findings"]]
+
+    def put(self, path: Path, findings: List[Finding]):
+        rel = path.relative_to(self.root).as_posix()
+        stored = []
+        for finding in findings:
+            data = asdict(finding)
+            del data["file"]  # rebuilt from the current root on load
+            stored.append(data)
+        self.seen.setdefault(rel, {"sha1": self._digest(path)})["findings"] = stored
+
+    def save(self, prune: bool = True):
+        """Write the cache; without prune, entries of files not seen this run are kept."""
+        files = {} if prune else dict(self.entries)
+        files.update((rel, entry) for rel, entry in self.seen.items() if entry.get("findings") is not None)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"version": self.version, "files": files}), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+def scoped_files(root: Path, rel_paths: Iterable[str]) -> List[Path]:
+    """Scannable files among rel_paths plus PROJECT_CONFIG_FILES, in a stable order."""
+    paths = []
+    for rel in sorted(set(rel_paths) | set(PROJECT_CONFIG_FILES)):
+        path = root / rel
+        if path.suffix.lower() in TEXT_EXTS and path.is_file() and not is_excluded(path):
+            paths.append(path)
+    return paths
+
+def touched_lines_filter(findings: List[Finding], root: Path, changed: Dict[str, Optional[Set[int]]]) -> List[Finding]:
+    """Keep findings on added/modified lines; PROJECT_CONFIG_FILES and new files are kept whole."""
+    kept = []
+    for finding in findings:
+        rel = _to_rel_posix(Path(finding.file), root)
+        lines = changed.get(rel)
+        if rel in PROJECT_CONFIG_FILES or lines is None or finding.line in lines:
+            kept.append(finding)
+    return kept
+
+def audit(
+    root: Path,
+    jobs: int = 1,
+    cache: Optional[AuditCache] = None,
+    files: Optional[List[Path]] = None,
+) -> List[Finding]:
+    findings: List[Finding] = []
+
+    detect_pubspec_security_notes(root, findings)
+
+    # Caches store snippets of earlier findings; never report on them
+    cache_files = {(root / DEFAULT_CACHE_REL_PATH).resolve()}
+    if cache is not None:
+        cache_files.add(cache.path.resolve())
+    paths = [path for path in (iter_files(root) if files is None else files) if path.resolve() not in cache_files]
+    if cache is None:
+        for file_findings in _scan_files(paths, root, jobs):
+            findings.extend(file_findings)
+    else:
+        cached = [cache.get(path) for path in paths]
+        scanned = iter(_scan_files([path for path, hit in zip(paths, cached) if hit is None], root, jobs))
+        for path, hit in zip(paths, cached):
+            if hit is None:
+                hit = next(scanned)
+                cache.put(path, hit)
+            findings.extend(hit)
+        cache.save(prune=files is None)
 
     # Deduplicate identical findings (same rule/file/line/snippet)
     uniq = {}
@@ -506,19 +801,55 @@ def main():
     )
     ap.add_argument("--severity", choices=["low", "medium", "high"], default="low",
                     help="Minimum severity to show (default: low)")
+    ap.add_argument("--jobs", "-j", type=int, default=1,
+                    help="Scan files in N worker processes (0 = one per CPU; default: 1)")
+    ap.add_argument(
+        "--cache",
+        nargs="?",
+        const=DEFAULT_CACHE_REL_PATH,
+        default=None,
+        help=f"Reuse findings of unchanged files from a cache (default: {DEFAULT_CACHE_REL_PATH})",
+    )
+    scope = ap.add_mutually_exclusive_group()
+    scope.add_argument("--changed-since", metavar="REF",
+                       help="Only scan files changed since a git ref (plus untracked files and project config)")
+    scope.add_argument("--staged", action="store_true",
+                       help="Only scan files staged in the git index (plus project config); "
+                            "their working-tree contents are scanned")
+    ap.add_argument("--lines-only", action="store_true",
+                    help="With --changed-since/--staged, only report findings on added or modified lines")
     args = ap.parse_args()
 
     root = Path(args.path).resolve()
     if not root.exists() or not root.is_dir():
         raise SystemExit(f"Invalid path: {root}")
 
-    findings = audit(root)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache = None
+    if args.cache:
+        cache_path = Path(args.cache)
+        if not cache_path.is_absolute():
+            cache_path = root / cache_path
+        cache = AuditCache(root, cache_path)
+    changed = None
+    if args.changed_since or args.staged:
+        from git_scope import changed_lines  # lives next to this script
+        try:
+            changed = changed_lines(root, args.changed_since, args.staged)
+        except RuntimeError as e:
+            raise SystemExit(str(e))
+    elif args.lines_only:
+        ap.error("--lines-only needs --changed-since or --staged")
+    findings = audit(root, jobs, cache, None if changed is None else scoped_files(root, changed))
+    if changed is not None and args.lines_only:
+        findings = touched_lines_filter(findings, root, changed)
     ignore_rules = load_ignore_rules(root, args.ignore_file)
     if ignore_rules:
+        ignore_matcher = IgnoreMatcher(root, ignore_rules)
         findings = [
             finding
             for finding in findings
-            if not should_ignore_finding(finding, root, ignore_rules)
+            if not ignore_matcher.matches(finding)
         ]
     findings = severity_filter(findings, args.severity)
 
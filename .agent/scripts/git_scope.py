@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+git_scope.py
+Changed files and lines from plain git, for diff-scoped scans.
+
+Shared by scripts/audit-app.py and
+skills/vulnerability-scanner/scripts/security_scan.py (--changed-since / --staged).
+
+Note: --staged selects files and line numbers from the index diff, but the
+scanners read the working-tree copy of each file. When a file has unstaged
+edits on top of staged ones, findings come from the working-tree content.
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+HUNK_RE = re.compile(r"""^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@""")
+
+DIFF_ARGS = ["--no-color", "--no-ext-diff", "--diff-filter=ACMR", "--relative"]
+
+
+def run_git(root: Path, args: List[str]) -> str:
+    """stdout of `git <args>` run in root; RuntimeError when git is missing or fails."""
+    try:
+        # Bytes, decoded below: text mode would turn a lone "\r" in content into "\n"
+        result = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=root, capture_output=True)
+    except FileNotFoundError:
+        raise RuntimeError("git not found: --changed-since/--staged need git on PATH")
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout.decode("utf-8", "replace")
+
+
+def changed_lines(root: Path, ref: Optional[str] = None, staged: bool = False) -> Dict[str, Optional[Set[int]]]:
+    """
+    Files changed against ref (working tree, plus untracked files) or staged in
+    the index, relative to root, mapped to their added/modified line numbers.
+    Untracked files map to None: every line is new.
+
+    File names come from `git diff --name-only -z`; the patch is only used for
+    hunk headers, and moves to the next file on each `diff --git` line (patch
+    content lines always start with '+', '-' or ' ', so neither header can be
+    mistaken for content).
+    """
+    target = ["--cached"] if staged else [ref]
+    names = [name for name in run_git(root, ["diff", "--name-only", "-z", *DIFF_ARGS, *target, "--"]).split("\0") if name]
+    changed: Dict[str, Optional[Set[int]]] = {name: set() for name in names}
+
+    # Split on "\n" only: str.splitlines() also breaks on "\r", "\x0b", U+2028...
+    # inside content lines, and a fragment could then start with "diff --git "
+    current = -1
+    for line in run_git(root, ["diff", "--unified=0", *DIFF_ARGS, *target, "--"]).split("\n"):
+        if line.startswith("diff --git "):
+            current += 1
+        elif line.startswith("@@") and 0 <= current < len(names):
+            m = HUNK_RE.match(line)
+            if m:
+                start = int(m.group(1))
+                count = int(m.group(2)) if m.group(2) is not None else 1
+                changed[names[current]].update(range(start, start + count))
+
+    if not staged:
+        for rel in run_git(root, ["ls-files", "-z", "--others", "--exclude-standard"]).split("\0"):
+            if rel:
+                changed[rel] = None
+    return changed
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+changed_lines() against throwaway git repositories: modified, renamed,
+untracked and staged files, and patch content that looks like diff headers.
+
+Usage: python -m unittest discover -s .agent/scripts -p "test_*.py"
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from git_scope import changed_lines
+
+
+@unittest.skipUnless(shutil.which("git"), "needs git on PATH")
+class ChangedLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.git("init", "-q")
+
+    def git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "-c", "commit.gpgsign=false", *args],
+            cwd=self.root, check=True, capture_output=True,
+        )
+
+    def write(self, rel, lines):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes("".join(f"{line}\n" for line in lines).encode("utf-8"))
+
+    def commit(self, files):
+        for rel, lines in files.items():
+            self.write(rel, lines)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "base")
+
+    def test_modified_untracked_and_nested(self):
+        self.commit({"lib/a.dart": ["a1", "a2", "a3", "a4"], "lib/b c.dart": ["b1", "b2"], "keep.txt": ["k"]})
+        self.write("lib/a.dart", ["a1", "A2", "a3", "a4", "a5"])
+        self.write("lib/b c.dart", ["b1"])          # deletion only: listed, no added lines
+        self.write("lib/new.dart", ["n1"])
+        self.assertEqual(changed_lines(self.root, "HEAD"), {
+            "lib/a.dart": {2, 5},
+            "lib/b c.dart": set(),
+            "lib/new.dart": None,
+        })
+        # Paths are relative to the directory asked for
+        self.assertEqual(changed_lines(self.root / "lib", "HEAD"), {
+            "a.dart": {2, 5},
+            "b c.dart": set(),
+            "new.dart": None,
+        })
+
+    def test_rename(self):
+        self.commit({"lib/old_name.dart": [f"line {i}" for i in range(1, 21)]})
+        self.git("mv", "lib/old_name.dart", "lib/new_name.dart")
+        self.write("lib/new_name.dart", [f"line {i}" for i in range(1, 21)] + ["line 21"])
+        self.assertEqual(changed_lines(self.root, "HEAD"), {"lib/new_name.dart": {21}})
+        self.git("add", "-A")
+        self.assertEqual(changed_lines(self.root, staged=True), {"lib/new_name.dart": {21}})
+
+    def test_staged(self):
+        self.commit({"a.txt": ["1", "2", "3"], "b.txt": ["1"]})
+        self.write("a.txt", ["1", "two", "3"])
+        self.git("add", "a.txt")
+        self.write("a.txt", ["1", "two", "three"])   # unstaged on top
+        self.write("b.txt", ["one"])                 # unstaged only
+        self.write("untracked.txt", ["u"])
+        self.assertEqual(changed_lines(self.root, staged=True), {"a.txt": {2}})
+        self.assertEqual(changed_lines(self.root, "HEAD"), {"a.txt": {2, 3}, "b.txt": {1}, "untracked.txt": None})
+
+    def test_content_that_looks_like_headers(self):
+        # Removed "-- " / added "++ " lines (SQL or Lua comments) and line
+        # separators other than "\n" followed by "diff --git " text
+        tricky = ["x\x0bdiff --git a/evil b/evil", "y\x1cdiff --git a/e b/e", "z diff --git a/e b/e",
+                  "w\rdiff --git a/e b/e", "v\x85diff --git a/e b/e"]
+        self.commit({
+            "db/a.sql": ["select 1;", "-- comment", "select 2;"],
+            "lib/b.dart": ["b1", "b2", "b3"],
+            "lib/c.dart": ["c1", "c2", "c3", "c4"],
+        })
+        self.write("db/a.sql", ["select 1;", "++ b/evil.py", "select 2;"])
+        self.write("lib/b.dart", ["b1"] + tricky + ["b3"])
+        self.write("lib/c.dart", ["c1", "C2", "C3", "c4"])
+        self.assertEqual(changed_lines(self.root, "HEAD"), {
+            "db/a.sql": {2},
+            "lib/b.dart": set(range(2, 2 + len(tricky))),
+            "lib/c.dart": {2, 3},
+        })
+
+    def test_bad_ref(self):
+        self.commit({"a.txt": ["1"]})
+        with self.assertRaises(RuntimeError):
+            changed_lines(self.root, "no-such-ref")
+
+
+if __name__ == "__main__":
+    unittest.main()
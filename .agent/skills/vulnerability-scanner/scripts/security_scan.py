@@ -4,6 +4,8 @@ Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
 Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
+       python security_scan.py <project_path> --changed-since origin/main [--lines-only]
+       python security_scan.py <project_path> --staged [--lines-only]
 Output: JSON with validation findings
 
 This script verifies:
@@ -19,7 +21,7 @@ import sys
 import re
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -89,18 +91,90 @@ SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'v
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
 
+# Dependency manifests and lock files (matched by file name, at any depth):
+# part of every --changed-since/--staged scan, and the dependency check only
+# runs there when one of them changed
+DEPENDENCY_MANIFESTS = {
+    'package.json', 'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml',
+    'setup.py', 'requirements.txt', 'Pipfile.lock', 'poetry.lock',
+}
+
+# Changed files/lines come from the shared git helper in .agent/scripts/git_scope.py
+AGENT_SCRIPTS_DIR = Path(__file__).resolve().parents[3] / "scripts"
+
+
+# ============================================================================
+#  CHANGE SCOPE (git)
+# ============================================================================
+
+def get_changed_lines(project_path: str, ref: Optional[str] = None, staged: bool = False) -> Dict[str, Optional[Set[int]]]:
+    """
+    Files changed against ref (working tree plus untracked files) or staged in
+    the index, relative to project_path, mapped to their added/modified lines.
+    Untracked files map to None (every line is new). With staged, the
+    working-tree copy of each staged file is what gets scanned.
+    """
+    if str(AGENT_SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(AGENT_SCRIPTS_DIR))
+    from git_scope import changed_lines
+    return changed_lines(Path(project_path), ref, staged)
+
+
+def is_dependency_manifest(rel_path: str) -> bool:
+    """True for a manifest or lock file anywhere in the tree (matched by file name)."""
+    return Path(rel_path).name in DEPENDENCY_MANIFESTS
+
+
+def scoped_manifests(changes: Dict[str, Optional[Set[int]]]) -> Set[str]:
+    """DEPENDENCY_MANIFESTS at the project root and next to every changed manifest."""
+    dirs = {"."} | {Path(rel).parent.as_posix() for rel in changes if is_dependency_manifest(rel)}
+    return {(Path(d) / name).as_posix() for d in dirs for name in DEPENDENCY_MANIFESTS}
+
+
+def iter_project_files(project_path: str, changes: Optional[Dict[str, Optional[Set[int]]]] = None):
+    """
+    Yield every file to scan: the whole tree (minus SKIP_DIRS), or only the
+    changed files plus existing scoped_manifests() when changes is given.
+    """
+    if changes is None:
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for file in files:
+                yield Path(root) / file
+        return
+
+    for rel in sorted(set(changes) | scoped_manifests(changes)):
+        if any(part in SKIP_DIRS for part in Path(rel).parts[:-1]):
+            continue
+        filepath = Path(project_path) / rel
+        if filepath.is_file():
+            yield filepath
+
+
+def touched_lines(changes: Optional[Dict[str, Optional[Set[int]]]], lines_only: bool, rel_path: str) -> Optional[Set[int]]:
+    """Lines findings in rel_path are limited to, or None to report the whole file."""
+    if changes is None or not lines_only:
+        return None
+    return changes.get(rel_path)
+
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def scan_dependencies(project_path: str, changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                      lines_only: bool = False) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
     Checks: npm audit, lock file presence, dependency age.
     """
     results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
     
+    if changes is not None and not any(is_dependency_manifest(rel) for rel in changes):
+        results["status"] = "[OK] No dependency manifest changed"
+        results["skipped"] = True
+        return results
+    
     # Check for lock files
     lock_files = {
         "npm": ["package-lock.json", "npm-shrinkwrap.json"],
@@ -178,7 +252,8 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def scan_secrets(project_path: str, changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                 lines_only: bool = False) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
@@ -191,34 +266,36 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in iter_project_files(project_path, changes):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
+            continue
+            
+        results["scanned_files"] += 1
+        rel_path = filepath.relative_to(project_path)
+        lines = touched_lines(changes, lines_only, rel_path.as_posix())
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
+                for pattern, secret_type, severity in SECRET_PATTERNS:
+                    if lines is None:
                         matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+                    else:
+                        matches = [m for m in re.finditer(pattern, content, re.IGNORECASE)
+                                   if content.count("\n", 0, m.start()) + 1 in lines]
+                    if matches:
+                        results["findings"].append({
+                            "file": str(rel_path),
+                            "type": secret_type,
+                            "severity": severity,
+                            "count": len(matches)
+                        })
+                        results["by_severity"][severity] += len(matches)
+                        
+        except Exception:
+            pass
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -233,7 +310,8 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                       lines_only: bool = False) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
@@ -246,36 +324,36 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in iter_project_files(project_path, changes):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS:
+            continue
+            
+        results["scanned_files"] += 1
+        rel_path = filepath.relative_to(project_path)
+        allowed = touched_lines(changes, lines_only, rel_path.as_posix())
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.readlines()
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+                for line_num, line in enumerate(lines, 1):
+                    if allowed is not None and line_num not in allowed:
+                        continue
+                    for pattern, name, severity, category in DANGEROUS_PATTERNS:
+                        if re.search(pattern, line, re.IGNORECASE):
+                            results["findings"].append({
+                                "file": str(rel_path),
+                                "line": line_num,
+                                "pattern": name,
+                                "severity": severity,
+                                "category": category,
+                                "snippet": line.strip()[:80]
+                            })
+                            results["by_category"][category] = results["by_category"].get(category, 0) + 1
+                            
+        except Exception:
+            pass
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -293,7 +371,8 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                       lines_only: bool = False) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
@@ -315,30 +394,33 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
     ]
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in iter_project_files(project_path, changes):
+        ext = filepath.suffix.lower()
+        if ext not in CONFIG_EXTENSIONS and filepath.name not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+            continue
+            
+        rel_path = filepath.relative_to(project_path)
+        lines = touched_lines(changes, lines_only, rel_path.as_posix())
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
                 
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+                for pattern, issue, severity in config_issues:
+                    if lines is None:
+                        found = re.search(pattern, content, re.IGNORECASE)
+                    else:
+                        found = any(content.count("\n", 0, m.start()) + 1 in lines
+                                    for m in re.finditer(pattern, content, re.IGNORECASE))
+                    if found:
+                        results["findings"].append({
+                            "file": str(rel_path),
+                            "issue": issue,
+                            "severity": severity
+                        })
+                        
+        except Exception:
+            pass
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -369,8 +451,14 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all",
+                  changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                  lines_only: bool = False) -> Dict[str, Any]:
+    """
+    Execute security validation scans.
+    With changes (from get_changed_lines), only changed files and dependency
+    manifests are scanned; lines_only also drops matches on untouched lines.
+    """
     
     report = {
         "project": project_path,
@@ -385,6 +473,9 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
+    if changes is not None:
+        report["scope"] = {"changed_files": len(changes), "lines_only": lines_only}
+    
     scanners = {
         "deps": ("dependencies", scan_dependencies),
         "secrets": ("secrets", scan_secrets),
@@ -394,7 +485,7 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = scanner(project_path, changes, lines_only)
             report["scans"][name] = result
             
             findings_count = len(result.get("findings", []))
@@ -427,14 +518,31 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--changed-since", metavar="REF",
+                       help="Only scan files changed since a git ref (plus untracked files)")
+    scope.add_argument("--staged", action="store_true",
+                       help="Only scan files staged in the git index (their working-tree contents are scanned)")
+    parser.add_argument("--lines-only", action="store_true",
+                        help="With --changed-since/--staged, only report matches on added or modified lines")
     
     args = parser.parse_args()
     
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
+    if args.lines_only and not (args.changed_since or args.staged):
+        parser.error("--lines-only needs --changed-since or --staged")
+    
+    changes = None
+    if args.changed_since or args.staged:
+        try:
+            changes = get_changed_lines(args.project_path, args.changed_since, args.staged)
+        except (OSError, RuntimeError) as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    result = run_full_scan(args.project_path, args.scan_type, changes, args.lines_only)
     
     if args.output == "summary":
         print(f"\n{'='*60}")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Diff-scoped scans of security_scan.py: dependency manifests are recognised
+by file name at any depth, not only at the project root.
+
+Usage: python -m unittest discover -s .agent/skills/vulnerability-scanner/scripts
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import security_scan
+
+
+class ScopedManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def touch(self, *rels):
+        for rel in rels:
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("{}\n", encoding="utf-8")
+
+    def test_nested_manifest_runs_dependency_scan(self):
+        for rel in ("app/package.json", "services/api/requirements.txt", "yarn.lock"):
+            with self.subTest(rel=rel):
+                result = security_scan.scan_dependencies(str(self.root), {rel: {1}, "src/index.js": {3}})
+                self.assertNotIn("skipped", result)
+        result = security_scan.scan_dependencies(str(self.root), {"src/index.js": {3}, "docs/package.md": {1}})
+        self.assertTrue(result.get("skipped"))
+
+    def test_manifests_next_to_changed_ones_are_scanned(self):
+        self.touch("package.json", "app/package.json", "app/package-lock.json", "other/package-lock.json",
+                   "app/node_modules/x/package.json", "src/index.js")
+        files = security_scan.iter_project_files(str(self.root), {"app/package.json": {2}, "src/index.js": None})
+        self.assertEqual([p.relative_to(self.root).as_posix() for p in files],
+                         ["app/package-lock.json", "app/package.json", "package.json", "src/index.js"])
+
+
+if __name__ == "__main__":
+    unittest.main()